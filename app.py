@@ -2,6 +2,7 @@
 Main Streamlit Application
 """
 import streamlit as st
+from metrics import sidebar_panel
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +13,7 @@ st.set_page_config(
 )
 
 def main():
+    sidebar_panel()
     st.title("Multi-Algorithm Encryption Suite")
     st.markdown("---")
     
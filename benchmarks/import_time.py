@@ -0,0 +1,84 @@
+"""
+Import-Time Benchmark: cold-start cost of the text_encryption entry points
+
+Each scenario runs in a fresh interpreter under `python -X importtime`.
+Run from the repository root:
+    python -m benchmarks.import_time --repeat 5 --budget-ms 30
+
+Exits with status 1 if a light scenario pulls in a heavy dependency
+or goes over the budget, so it can guard against regressions in CI.
+"""
+import argparse
+import subprocess
+import sys
+
+# name -> (statement, heavy modules it must not import)
+SCENARIOS = {
+    "package": ("import text_encryption", ("numpy", "Crypto")),
+    "caesar": ("from text_encryption import caesar_encrypt", ("numpy", "Crypto")),
+    "vigenere": ("from text_encryption import vigenere_encrypt", ("numpy", "Crypto")),
+    "affine": ("from text_encryption import affine_encrypt", ("numpy", "Crypto")),
+    "des": ("from text_encryption import des_encrypt", ("numpy", "Crypto")),
+    "transposition": ("from text_encryption import transposition_encrypt", ("numpy", "Crypto")),
+    "hill": ("from text_encryption import hill_encrypt", ()),
+    "aes": ("from text_encryption import aes_encrypt", ()),
+    "everything": ("from text_encryption import *", ()),
+}
+
+def import_profile(statement: str) -> tuple:
+    """(cumulative microseconds of each outermost import, all packages imported)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    outermost, packages = {}, set()
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        packages.add(name.strip().split(".")[0])
+        # Nested imports are indented below their importer and already
+        # counted in its cumulative time
+        if not name.startswith("  "):
+            name = name.strip()
+            outermost[name] = outermost.get(name, 0) + int(cumulative)
+    return outermost, packages
+
+def measure(statement: str, repeat: int, baseline: set) -> tuple:
+    """(best milliseconds, packages imported) over repeat fresh interpreters
+
+    Imports an empty interpreter already makes (baseline) are left out.
+    """
+    best, packages = float('inf'), set()
+    for _ in range(repeat):
+        outermost, packages = import_profile(statement)
+        total = sum(us for name, us in outermost.items() if name not in baseline)
+        best = min(best, total / 1000)
+    return best, packages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if a light scenario takes longer than this")
+    args = parser.parse_args()
+
+    baseline = set(import_profile("pass")[0])
+    failures = []
+    print(f"{'scenario':<16}{'ms':>10}  heavy modules")
+    for name, (statement, forbidden) in SCENARIOS.items():
+        ms, packages = measure(statement, args.repeat, baseline)
+        heavy = [m for m in ("numpy", "Crypto") if m in packages]
+        print(f"{name:<16}{ms:>10.1f}  {', '.join(heavy) or '-'}")
+
+        leaked = [m for m in forbidden if m in packages]
+        if leaked:
+            failures.append(f"{name} imports {', '.join(leaked)}")
+        if forbidden and args.budget_ms is not None and ms > args.budget_ms:
+            failures.append(f"{name} took {ms:.1f} ms (budget {args.budget_ms} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark Suite: throughput, latency and peak memory of every cipher
+
+Sweeps every *_encrypt/*_decrypt in text_encryption and both image
+paths in image_encryption across input sizes. Run from the repository
+root:
+    python -m benchmarks.suite --sizes 1K 1M 100M --json results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from functools import partial
+import numpy as np
+import text_encryption
+import image_encryption
+from text_encryption import rsa_generate_keys
+from image_encryption import clear_keystream_cache
+
+DEFAULT_SIZES = ["1K", "10K", "100K", "1M", "10M", "100M"]
+KEY = "BenchmarkKey123"
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+_rsa_keys = None
+
+def _rsa(index: int) -> tuple:
+    """RSA key pair, generated once and only if RSA is benchmarked"""
+    global _rsa_keys
+    if _rsa_keys is None:
+        _rsa_keys = rsa_generate_keys(1024)
+    return _rsa_keys[index]
+
+# Function name prefix -> arguments after the input (callables are
+# evaluated lazily)
+TEXT_ARGS = {
+    "transposition": (KEY,),
+    "caesar": (3,),
+    "affine": (5, 8),
+    "hill": ([[3, 3], [2, 5]],),
+    "vigenere": (KEY,),
+    "des": (KEY,),
+    "aes": (KEY,),
+    "aes_gcm": (KEY,),
+    "rsa_encrypt": (lambda: _rsa(0),),
+    "rsa_decrypt": (lambda: _rsa(1),),
+    "parallel": ("vigenere", KEY),
+}
+
+IMAGE_FUNCTIONS = [
+    "chaotic_image_encrypt", "chaotic_image_decrypt",
+    "simple_xor_encrypt", "simple_xor_decrypt",
+    "stream_xor_encrypt", "stream_xor_decrypt",
+    "tiled_xor_encrypt", "tiled_xor_decrypt",
+    "permutation_diffusion_encrypt", "permutation_diffusion_decrypt",
+]
+
+def parse_size(text: str) -> int:
+    """'64K' -> 65536"""
+    match = re.fullmatch(r"(\d+)([KMG]?)B?", text.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {text}")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+def format_size(size: int) -> str:
+    """65536 -> '64K'"""
+    for unit in ("G", "M", "K"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+def _text_args(name: str) -> tuple:
+    """Key arguments for a text cipher function, longest prefix first"""
+    prefix = max((p for p in TEXT_ARGS if name.startswith(p)), key=len)
+    return tuple(arg() if callable(arg) else arg for arg in TEXT_ARGS[prefix])
+
+# Mixed-case letters, spaces and punctuation
+_ALPHABET = np.frombuffer(b"ETAOINSHRDLUetaoinshrdlucmfwypvbgkjqxz    ,.", dtype=np.uint8)
+
+def make_text(size: int) -> str:
+    """Deterministic ASCII text of size bytes"""
+    codes = np.random.default_rng(size).choice(_ALPHABET, size)
+    return codes.tobytes().decode('ascii')
+
+def make_image(size: int) -> np.ndarray:
+    """Deterministic RGB image of about size bytes"""
+    side = max(1, int((size / 3) ** 0.5))
+    return np.random.default_rng(size).integers(0, 256, (side, side, 3), dtype=np.uint8)
+
+def _cipher_text(encrypt_name: str):
+    """Input factory for a decrypt function: the output of its encrypt"""
+    encrypt = getattr(text_encryption, encrypt_name)
+    return lambda size: encrypt(make_text(size), *_text_args(encrypt_name))
+
+def cases(pattern: str) -> list:
+    """(name, function, input factory, key arguments factory) of every benchmark"""
+    found = []
+    for name in text_encryption.__all__:
+        if not name.endswith(("_encrypt", "_decrypt")) or not re.search(pattern, name):
+            continue
+        if name.endswith("_decrypt"):
+            prepare = _cipher_text(name[:-len("_decrypt")] + "_encrypt")
+        else:
+            prepare = make_text
+        found.append((name, getattr(text_encryption, name), prepare, partial(_text_args, name)))
+
+    for name in IMAGE_FUNCTIONS:
+        if re.search(pattern, name):
+            found.append((name, getattr(image_encryption, name), make_image, lambda: (KEY,)))
+    return found
+
+def run_case(func, data, args: tuple, min_time: float, max_repeat: int) -> dict:
+    """Time func(data, *args) until min_time has passed, then trace its memory
+
+    The keystream cache is emptied before every run, so image ciphers
+    are timed with their keystream generation rather than cache hits.
+    """
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_repeat:
+        clear_keystream_cache()
+        t0 = time.perf_counter()
+        func(data, *args)
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - start >= min_time:
+            break
+
+    # Separate traced run: tracemalloc slows allocation-heavy code down
+    clear_keystream_cache()
+    tracemalloc.start()
+    try:
+        func(data, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mean = sum(times) / len(times)
+    return {"runs": len(times), "best_s": min(times), "mean_s": mean,
+            "ops_per_s": 1 / mean, "peak_bytes": peak}
+
+def run_suite(sizes: list, pattern: str = "", min_time: float = 0.2,
+              max_repeat: int = 50, time_limit: float = 10.0, log=print) -> list:
+    """Benchmark every case at every size
+
+    Sizes at which a call is expected to take longer than time_limit
+    seconds, extrapolating linearly from the previous size, are skipped.
+    """
+    results = []
+    for name, func, prepare, args in cases(pattern):
+        previous = None
+        for size in sorted(sizes):
+            if previous and previous["best_s"] * size / previous["size"] > time_limit:
+                log(f"{name:<28}{format_size(size):>6}  skipped (over --time-limit)")
+                break
+            data = prepare(size)
+            result = run_case(func, data, args(), min_time, max_repeat)
+            nbytes = data.nbytes if isinstance(data, np.ndarray) else len(data)
+            result.update(name=name, size=size, input_bytes=nbytes,
+                          mb_per_s=nbytes / (1 << 20) / result["mean_s"],
+                          best_mb_per_s=nbytes / (1 << 20) / result["best_s"])
+            results.append(result)
+            previous = result
+            log(f"{name:<28}{format_size(size):>6}{result['ops_per_s']:>12.1f}"
+                f"{result['mb_per_s']:>12.1f}{result['peak_bytes'] / (1 << 20):>12.1f}")
+    return results
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """Entries whose MB/s dropped by more than threshold against the baseline
+
+    Best-of-N throughput is compared, as it is far less noisy than the mean.
+    """
+    reference = {(r["name"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get((result["name"], result["size"]))
+        if base is None:
+            continue
+        change = result["best_mb_per_s"] / base["best_mb_per_s"] - 1
+        if change < -threshold:
+            regressions.append((result["name"], result["size"], base["best_mb_per_s"],
+                                result["best_mb_per_s"], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=parse_size, nargs="+",
+                        default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help="input sizes such as 1K 64K 1M 100M")
+    parser.add_argument("--filter", default="", help="regex selecting function names")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds to keep repeating each measurement")
+    parser.add_argument("--max-repeat", type=int, default=50)
+    parser.add_argument("--time-limit", type=float, default=10.0,
+                        help="skip sizes expected to take longer than this per call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed drop in best MB/s against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    print(f"{'function':<28}{'size':>6}{'ops/s':>12}{'MB/s':>12}{'peak MB':>12}")
+    results = run_suite(args.sizes, args.filter, args.min_time, args.max_repeat, args.time_limit)
+
+    if args.json:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, size, before, after, change in regressions:
+            print(f"REGRESSION: {name} at {format_size(size)}: "
+                  f"{before:.1f} -> {after:.1f} MB/s ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
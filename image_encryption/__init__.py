@@ -1,4 +1,10 @@
 """
 Image encryption algorithms package
 """
-from .chaotic_encryption import *
\ No newline at end of file
+from .keystream_cache import *
+from .chaotic_encryption import *
+from .keystream import *
+from .container import *
+from .tiled import *
+from .permutation_diffusion import *
+from .pipeline import *
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Command-line Batch Image Encryption
+
+Encrypt or decrypt an image or a whole directory of images into PNGs
+or raw .eimg containers, for example:
+    python -m image_encryption encrypt photos/ photos_enc/ --key secret --workers 4
+    python -m image_encryption encrypt photos/ photos_enc/ --key secret --format eimg
+    python -m image_encryption decrypt photos_enc/ photos/ --key secret --cipher simple_xor
+"""
+import argparse
+import os
+import sys
+from .pipeline import IMAGE_CIPHERS, OUTPUT_FORMATS, STAGES, plan_images, run_pipeline
+
+MB = 1 << 20
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m image_encryption",
+                                     description="Encrypt or decrypt images and image directories")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("input", help="image file or directory to read")
+    parser.add_argument("output", help="file or directory to write")
+    parser.add_argument("--key", required=True, help="encryption key")
+    parser.add_argument("--cipher", choices=IMAGE_CIPHERS, default="simple_xor")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="png",
+                        help="output format: PNG or the uncompressed .eimg container")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="threads per stage (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="images waiting between two stages (default: 2 * workers)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} does not exist")
+    try:
+        jobs = plan_images(args.input, args.output, OUTPUT_FORMATS[args.format])
+    except ValueError as e:
+        parser.error(str(e))
+
+    def progress(done, total, src, error):
+        if error is not None:
+            print(f"Error: {src}: {error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"[{done}/{total}] {src}")
+
+    report = run_pipeline(jobs, args.key, args.cipher, args.mode == "decrypt",
+                          args.workers, args.queue_size, progress, args.format)
+
+    elapsed = report['elapsed']
+    print(f"{report['images']} image(s), {report['bytes'] / MB:.2f} MB of pixels in {elapsed:.3f}s "
+          f"({report['images'] / max(elapsed, 1e-9):.1f} images/s)")
+    print("stage busy time: " + ", ".join(f"{name} {report['stages'][name]:.3f}s" for name in STAGES))
+    return 1 if report['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
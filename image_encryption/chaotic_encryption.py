@@ -3,99 +3,186 @@ Chaotic Image Encryption Implementation - FIXED VERSION
 """
 import numpy as np
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from .keystream_cache import KEYSTREAM_CACHE
 
-def generate_key_from_hash(key: str, shape: tuple) -> np.ndarray:
-    """Generate deterministic key array from hash matching image shape"""
+# Smallest row band worth handing to a thread of its own
+MIN_BAND_BYTES = 1 << 20
+
+def _channel_seed(key: str) -> int:
+    """Deterministic RandomState seed from the SHA-256 of key"""
     # Generate SHA-256 hash from key
     key_hash = hashlib.sha256(key.encode()).digest()
-    
+
     # Create deterministic seed from hash (ensure it's within valid range)
     # Use modulo to ensure seed is within 0 to 2^32 - 1
-    seed = int.from_bytes(key_hash[:4], 'big') % (2**32 - 1)
-    
-    # Generate key array matching image shape
-    if len(shape) == 3:
-        # Color image (height, width, channels)
-        height, width, channels = shape
-        key_array = np.zeros((height, width, channels), dtype=np.uint8)
-        # Generate key for each channel separately
-        for c in range(channels):
-            # Create new random state for each channel with different seed
-            channel_seed = (seed + c * 1000) % (2**32 - 1)
-            rng = np.random.RandomState(channel_seed)
-            key_array[:, :, c] = rng.randint(0, 256, size=(height, width), dtype=np.uint8)
-    else:
+    return int.from_bytes(key_hash[:4], 'big') % (2**32 - 1)
+
+def _channels(shape: tuple) -> list:
+    """Channel indices of a color image, [None] for grayscale"""
+    return list(range(shape[2])) if len(shape) == 3 else [None]
+
+def _channel_key(seed: int, shape: tuple, c) -> np.ndarray:
+    """Key plane of channel c (None for grayscale)"""
+    if c is None:
         # Grayscale image (height, width)
-        height, width = shape
         rng = np.random.RandomState(seed)
-        key_array = rng.randint(0, 256, size=(height, width), dtype=np.uint8)
-    
+        return rng.randint(0, 256, size=shape, dtype=np.uint8)
+    # Color image (height, width, channels): new random state for each
+    # channel with a different seed
+    channel_seed = (seed + c * 1000) % (2**32 - 1)
+    rng = np.random.RandomState(channel_seed)
+    return rng.randint(0, 256, size=shape[:2], dtype=np.uint8)
+
+def _run(func, items, threads: int) -> None:
+    """Call func on every item, spread over up to threads threads"""
+    items = list(items)
+    if threads <= 1 or len(items) <= 1:
+        for item in items:
+            func(item)
+        return
+    with ThreadPoolExecutor(max_workers=min(threads, len(items))) as pool:
+        # Consuming the results re-raises any worker exception
+        for _ in pool.map(func, items):
+            pass
+
+def _bands(shape: tuple, threads: int) -> list:
+    """(start, end) byte ranges of up to threads row bands covering shape
+
+    Bands hold whole rows and at least MIN_BAND_BYTES, so small images
+    stay on the calling thread.
+    """
+    size = int(np.prod(shape, dtype=np.int64))
+    height = shape[0] if shape else 1
+    row_bytes = size // height if height else 0
+    count = max(1, min(threads, height, size // MIN_BAND_BYTES))
+    edges = [height * i // count * row_bytes for i in range(count + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+def generate_key_from_hash(key: str, shape: tuple, threads: int = 1) -> np.ndarray:
+    """Generate deterministic key array from hash matching image shape
+
+    With threads > 1 the channel planes are generated concurrently
+    (RandomState releases the GIL while filling).
+    """
+    key_array = np.empty(shape, dtype=np.uint8)
+    seed = _channel_seed(key)
+
+    def fill(c):
+        if c is None:
+            key_array[...] = _channel_key(seed, shape, c)
+        else:
+            key_array[:, :, c] = _channel_key(seed, shape, c)
+
+    _run(fill, _channels(shape), threads)
     return key_array
 
-def chaotic_image_encrypt(image_array: np.ndarray, key: str) -> np.ndarray:
-    """Simple XOR-based image encryption that works correctly"""
-    # Ensure image is uint8 and copy to avoid modifying original
-    image_array = image_array.astype(np.uint8).copy()
-    
-    # Generate key array matching image shape
-    key_array = generate_key_from_hash(key, image_array.shape)
-    
-    # XOR encryption
-    encrypted = np.bitwise_xor(image_array, key_array)
-    
-    return encrypted.astype(np.uint8)
-
-def chaotic_image_decrypt(encrypted_array: np.ndarray, key: str) -> np.ndarray:
+def _as_uint8(array: np.ndarray) -> np.ndarray:
+    """The array itself if it already is uint8, else a uint8 copy"""
+    return np.asarray(array).astype(np.uint8, copy=False)
+
+def _output(array: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Check a caller-supplied out buffer, or allocate one"""
+    if out is None:
+        return np.empty(array.shape, dtype=np.uint8)
+    if out.shape != array.shape or out.dtype != np.uint8:
+        raise ValueError(f"out must be a uint8 array of shape {array.shape}")
+    return out
+
+def _flat(out: np.ndarray) -> np.ndarray:
+    """1-D view of a C-contiguous output buffer"""
+    if not out.flags.c_contiguous:
+        raise ValueError("out must be C-contiguous")
+    return out.reshape(-1)
+
+def chaotic_image_encrypt(image_array: np.ndarray, key: str, out: np.ndarray = None,
+                          threads: int = 1) -> np.ndarray:
+    """XOR image encryption with a per-channel RandomState keystream
+
+    A key that fits the keystream cache is generated once per (key,
+    shape) and reused; otherwise it is generated and XORed one channel
+    plane at a time straight into out. out may be image_array itself
+    for in-place encryption.
+
+    threads > 1 XORs row bands concurrently. RandomState cannot seek, so
+    key generation only splits across the color channels.
+    """
+    image_array = _as_uint8(image_array)
+    out = _output(image_array, out)
+
+    shape = image_array.shape
+    key_array = KEYSTREAM_CACHE.get(key, shape, np.uint8, 'randomstate',
+                                    lambda: generate_key_from_hash(key, shape, threads))
+    if key_array is not None:
+        src = np.ascontiguousarray(image_array).reshape(-1)
+        stream = key_array.reshape(-1)
+        dst = _flat(out)
+
+        def xor_band(band):
+            start, end = band
+            np.bitwise_xor(src[start:end], stream[start:end], out=dst[start:end])
+
+        _run(xor_band, _bands(shape, threads), threads)
+        return out
+
+    seed = _channel_seed(key)
+
+    def xor_plane(c):
+        plane = _channel_key(seed, shape, c)
+        if c is None:
+            np.bitwise_xor(image_array, plane, out=out)
+        else:
+            np.bitwise_xor(image_array[:, :, c], plane, out=out[:, :, c])
+
+    _run(xor_plane, _channels(shape), threads)
+    return out
+
+def chaotic_image_decrypt(encrypted_array: np.ndarray, key: str, out: np.ndarray = None,
+                          threads: int = 1) -> np.ndarray:
     """Decrypt image - XOR is symmetric, so same as encryption"""
-    # Ensure encrypted array is uint8
-    encrypted_array = encrypted_array.astype(np.uint8).copy()
-    
-    # Generate same key array
-    key_array = generate_key_from_hash(key, encrypted_array.shape)
-    
-    # XOR decryption (same as encryption for XOR)
-    decrypted = np.bitwise_xor(encrypted_array, key_array)
-    
-    return decrypted.astype(np.uint8)
+    return chaotic_image_encrypt(encrypted_array, key, out, threads)
+
+def xor_repeating(data: np.ndarray, pattern: np.ndarray, out: np.ndarray, offset: int = 0) -> np.ndarray:
+    """XOR the bytes of data, in C order, with pattern repeated forever
+
+    The pattern is broadcast over whole periods rather than tiled, so
+    no keystream the size of the image is ever built. offset is the
+    position of data's first byte in the repeating stream.
+    """
+    period = pattern.size
+    pattern = np.roll(pattern, -(offset % period))
+    src = np.ascontiguousarray(data).reshape(-1)
+    dst = _flat(out)
+
+    whole = src.size - src.size % period
+    np.bitwise_xor(src[:whole].reshape(-1, period),
+                   np.broadcast_to(pattern, (whole // period, period)),
+                   out=dst[:whole].reshape(-1, period))
+    np.bitwise_xor(src[whole:], pattern[:src.size - whole], out=dst[whole:])
+    return out
 
 # Alternative simpler method without RandomState
-def simple_xor_encrypt(image_array: np.ndarray, key: str) -> np.ndarray:
-    """Even simpler XOR encryption using hash directly"""
-    # Get image dimensions
-    if len(image_array.shape) == 3:
-        height, width, channels = image_array.shape
-    else:
-        height, width = image_array.shape
-        channels = 1
-    
-    # Generate key from hash
-    key_hash = hashlib.sha256(key.encode()).digest()
-    key_bytes = bytearray(key_hash)
-    
-    # Repeat key to match image size
-    total_pixels = height * width * channels
-    key_expanded = bytearray()
-    
-    while len(key_expanded) < total_pixels:
-        key_expanded.extend(key_bytes)
-    
-    # Trim to exact size
-    key_expanded = key_expanded[:total_pixels]
-    
-    # Convert to numpy array
-    key_array = np.frombuffer(key_expanded, dtype=np.uint8)
-    
-    # Reshape to match image
-    if channels > 1:
-        key_array = key_array.reshape(height, width, channels)
-    else:
-        key_array = key_array.reshape(height, width)
-    
-    # XOR encryption
-    encrypted = np.bitwise_xor(image_array, key_array)
-    
-    return encrypted.astype(np.uint8)
-
-def simple_xor_decrypt(encrypted_array: np.ndarray, key: str) -> np.ndarray:
+def simple_xor_encrypt(image_array: np.ndarray, key: str, out: np.ndarray = None,
+                       threads: int = 1) -> np.ndarray:
+    """XOR encryption with the SHA-256 digest of key repeated over the image
+
+    Pass out=image_array to encrypt in place, and threads > 1 to XOR
+    row bands concurrently.
+    """
+    image_array = _as_uint8(image_array)
+    out = _output(image_array, out)
+    key_hash = np.frombuffer(hashlib.sha256(key.encode()).digest(), dtype=np.uint8)
+    src = np.ascontiguousarray(image_array).reshape(-1)
+    dst = _flat(out)
+
+    def xor_band(band):
+        start, end = band
+        xor_repeating(src[start:end], key_hash, dst[start:end], offset=start)
+
+    _run(xor_band, _bands(image_array.shape, threads), threads)
+    return out
+
+def simple_xor_decrypt(encrypted_array: np.ndarray, key: str, out: np.ndarray = None,
+                       threads: int = 1) -> np.ndarray:
     """Decrypt using simple XOR method"""
-    return simple_xor_encrypt(encrypted_array, key)
\ No newline at end of file
+    return simple_xor_encrypt(encrypted_array, key, out, threads)
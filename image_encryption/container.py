@@ -0,0 +1,165 @@
+"""
+Raw Container Format for Encrypted Images
+
+Encrypted pixels are close to random, so PNG compression costs a lot of
+CPU and saves nothing. A container is a small header followed by the
+raw pixel bytes in C order:
+
+    offset  size  field
+    0       8     magic b'\\x89EIMG\\r\\n\\x1a'
+    8       2     format version (little-endian uint16)
+    10      4     header size = offset of the pixels (uint32, multiple of 64)
+    14      1     number of dimensions n
+    15      8n    shape (uint64 each)
+    ...           dtype, PIL mode of the source image and keystream/cipher
+                  method, each as a length byte plus ASCII
+    ...           zero padding up to the header size
+
+Pixels start on a 64-byte boundary so they can be memory-mapped and
+used in place.
+"""
+import math
+import struct
+import sys
+from collections import namedtuple
+import numpy as np
+
+MAGIC = b'\x89EIMG\r\n\x1a'
+VERSION = 1
+CONTAINER_EXTENSION = '.eimg'
+CONTAINER_MIME = 'application/octet-stream'
+
+_FIXED = struct.Struct('<8sHIB')
+_ALIGN = 64
+# Upper bound of any header: 255 dimensions and three 255-byte fields
+MAX_HEADER = 4096
+# Pixel dtype kinds a container may hold: plain numbers only, never objects
+_DTYPE_KINDS = 'biuf'
+# Largest pixel data a container may declare: what an index can address
+MAX_DATA_BYTES = sys.maxsize
+
+ContainerHeader = namedtuple('ContainerHeader', 'version shape dtype mode method offset')
+
+def default_mode(shape: tuple) -> str:
+    """PIL mode of an array of shape, as array_to_image would pick it"""
+    if len(shape) == 3:
+        return {4: 'RGBA', 2: 'LA'}.get(shape[2], 'RGB')
+    return 'L'
+
+def _text(value: str) -> bytes:
+    data = value.encode('ascii')
+    if len(data) > 255:
+        raise ValueError(f"Container field too long: {value!r}")
+    return bytes([len(data)]) + data
+
+def pack_header(shape: tuple, dtype, mode: str = None, method: str = '') -> bytes:
+    """Header bytes for pixels of shape and dtype, padded to the data offset"""
+    dtype = np.dtype(dtype)
+    mode = mode or default_mode(shape)
+    body = (struct.pack(f'<{len(shape)}Q', *shape)
+            + _text(dtype.str) + _text(mode) + _text(method))
+    size = _FIXED.size + len(body)
+    size += -size % _ALIGN
+    header = _FIXED.pack(MAGIC, VERSION, size, len(shape)) + body
+    return header.ljust(size, b'\0')
+
+def read_header(data: bytes) -> ContainerHeader:
+    """Parse the header at the start of data (bytes-like, header included)"""
+    data = bytes(data[:MAX_HEADER])
+    if len(data) < _FIXED.size:
+        raise ValueError("Not an encrypted image container: too short")
+    magic, version, offset, ndim = _FIXED.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an encrypted image container: bad magic")
+    if version > VERSION:
+        raise ValueError(f"Unsupported container version {version}")
+    if len(data) < offset:
+        raise ValueError("Truncated container header")
+
+    try:
+        pos = _FIXED.size
+        shape = struct.unpack_from(f'<{ndim}Q', data, pos)
+        pos += 8 * ndim
+        fields = []
+        for _ in range(3):
+            length = data[pos]
+            fields.append(data[pos + 1:pos + 1 + length].decode('ascii'))
+            pos += 1 + length
+        dtype, mode, method = fields
+        dtype = np.dtype(dtype)
+    except (struct.error, IndexError, UnicodeDecodeError, TypeError) as e:
+        raise ValueError(f"Corrupt container header: {e}") from None
+
+    if dtype.hasobject or dtype.kind not in _DTYPE_KINDS:
+        raise ValueError(f"Unsupported container dtype {dtype.str!r}")
+    if offset < pos or offset % _ALIGN:
+        raise ValueError(f"Corrupt container header: bad pixel offset {offset}")
+    # Python ints: a crafted shape must not wrap around in int64
+    if any(n < 0 or n > MAX_DATA_BYTES for n in shape):
+        raise ValueError(f"Corrupt container header: bad shape {shape}")
+    if math.prod(shape) * dtype.itemsize > MAX_DATA_BYTES:
+        raise ValueError(f"Container pixel data too large: shape {shape} of {dtype.str}")
+    return ContainerHeader(version, tuple(shape), dtype, mode, method, offset)
+
+def _count(header: ContainerHeader) -> int:
+    """Number of pixel values in a container"""
+    return math.prod(header.shape)
+
+def _check_size(header: ContainerHeader, available: int) -> None:
+    needed = header.offset + _count(header) * header.dtype.itemsize
+    if available < needed:
+        raise ValueError(f"Truncated container: {available} bytes, expected {needed}")
+
+def pack_container(array: np.ndarray, mode: str = None, method: str = '') -> bytes:
+    """Container bytes for array, e.g. for a download"""
+    array = np.ascontiguousarray(array)
+    return pack_header(array.shape, array.dtype, mode, method) + array.tobytes()
+
+def unpack_container(data: bytes) -> tuple:
+    """(array, header) of container bytes; the array is a read-only view of data"""
+    header = read_header(data)
+    _check_size(header, len(data))
+    array = np.frombuffer(data, dtype=header.dtype, count=_count(header), offset=header.offset)
+    return array.reshape(header.shape), header
+
+def is_container(data: bytes) -> bool:
+    """Whether data starts with the container magic"""
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+def write_container(path: str, array: np.ndarray, mode: str = None, method: str = '') -> None:
+    """Write array to path as a container"""
+    array = np.ascontiguousarray(array)
+    with open(path, 'wb') as f:
+        f.write(pack_header(array.shape, array.dtype, mode, method))
+        f.write(memoryview(array.reshape(-1)).cast('B'))
+
+def read_file_header(path: str) -> ContainerHeader:
+    """Header of a container file, checking the pixels are all there"""
+    with open(path, 'rb') as f:
+        header = read_header(f.read(MAX_HEADER))
+        f.seek(0, 2)
+        _check_size(header, f.tell())
+    return header
+
+def load_container(path: str, mmap_mode: str = 'r') -> tuple:
+    """(array, header) of a container file
+
+    With mmap_mode ('r', 'r+' or 'c') the pixels are memory-mapped and
+    nothing is copied; with None they are read into a new array.
+    """
+    header = read_file_header(path)
+    if mmap_mode is None:
+        array = np.fromfile(path, dtype=header.dtype, count=_count(header), offset=header.offset)
+        return array.reshape(header.shape), header
+    array = np.memmap(path, dtype=header.dtype, mode=mmap_mode,
+                      offset=header.offset, shape=header.shape)
+    return array, header
+
+def create_container(path: str, shape: tuple, dtype=np.uint8, mode: str = None,
+                     method: str = '') -> np.memmap:
+    """Create a container file of shape and return its writable pixels"""
+    header = pack_header(shape, dtype, mode, method)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.truncate(len(header) + math.prod(shape) * np.dtype(dtype).itemsize)
+    return np.memmap(path, dtype=dtype, mode='r+', offset=len(header), shape=tuple(shape))
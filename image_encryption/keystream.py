@@ -0,0 +1,136 @@
+"""
+Counter-Mode Keystreams for Image Encryption
+
+Every keystream here is a pure function of (key, byte offset), so any
+byte range can be produced on its own: tiles, row bands and threads
+generate just their part and the pieces join up to the whole stream.
+"""
+import hashlib
+import numpy as np
+from .chaotic_encryption import _as_uint8, _bands, _flat, _output, _run
+from .keystream_cache import KEYSTREAM_CACHE
+
+# Bytes produced per counter value by each method
+PHILOX_BLOCK = 32   # Philox4x64: four 64-bit words
+BLAKE2B_BLOCK = 64  # one full BLAKE2b digest
+REPEAT_BLOCK = 32   # one SHA-256 digest
+
+DEFAULT_METHOD = "philox"
+
+# stream_xor_encrypt generates and applies the keystream this many bytes at a time
+STREAM_CHUNK = 1 << 22
+
+def key_digest(key: str) -> bytes:
+    """SHA-256 of the text key, the root of every keystream"""
+    return hashlib.sha256(key.encode()).digest()
+
+def _block_range(start: int, length: int, block: int) -> tuple:
+    """(first block, number of blocks, offset into the first block)"""
+    first = start // block
+    last = -(-(start + length) // block)
+    return first, last - first, start - first * block
+
+def philox_keystream(key: str, start: int, length: int) -> np.ndarray:
+    """Bytes [start, start + length) of the Philox4x64 stream under key
+
+    Philox is counter-based: the stream at counter c is the block cipher
+    output for c, so seeking is just setting the counter.
+    """
+    digest = key_digest(key)
+    first, count, skip = _block_range(start, length, PHILOX_BLOCK)
+    philox = np.random.Philox(key=int.from_bytes(digest[:16], 'little'), counter=first)
+    words = philox.random_raw(count * (PHILOX_BLOCK // 8))
+    # Fixed byte order so the stream is the same on every platform
+    stream = words.astype('<u8', copy=False).view(np.uint8)
+    return stream[skip:skip + length]
+
+def blake2b_keystream(key: str, start: int, length: int) -> np.ndarray:
+    """Bytes [start, start + length) of BLAKE2b in counter mode under key
+
+    Block i is the keyed BLAKE2b digest of the 16-byte counter i.
+    """
+    digest = key_digest(key)
+    first, count, skip = _block_range(start, length, BLAKE2B_BLOCK)
+    blocks = b''.join([
+        hashlib.blake2b(i.to_bytes(16, 'little'), key=digest, digest_size=BLAKE2B_BLOCK).digest()
+        for i in range(first, first + count)
+    ])
+    return np.frombuffer(blocks, dtype=np.uint8)[skip:skip + length]
+
+def repeat_keystream(key: str, start: int, length: int) -> np.ndarray:
+    """Bytes [start, start + length) of the SHA-256 digest repeated
+
+    The keystream of simple_xor_encrypt; it repeats every 32 bytes.
+    """
+    pattern = np.frombuffer(key_digest(key), dtype=np.uint8)
+    pattern = np.roll(pattern, -(start % REPEAT_BLOCK))
+    return np.tile(pattern, -(-length // REPEAT_BLOCK))[:length]
+
+KEYSTREAMS = {
+    "philox": philox_keystream,
+    "blake2b": blake2b_keystream,
+    "repeat": repeat_keystream,
+}
+
+def keystream(key: str, start: int, length: int, method: str = DEFAULT_METHOD) -> np.ndarray:
+    """Bytes [start, start + length) of the keystream selected by method"""
+    try:
+        generate = KEYSTREAMS[method]
+    except KeyError:
+        raise ValueError(f"Unknown keystream method '{method}', "
+                         f"expected one of: {', '.join(KEYSTREAMS)}") from None
+    if start < 0 or length < 0:
+        raise ValueError("Keystream range must not be negative")
+    return generate(key, start, length)
+
+def _build_keystream(key: str, shape: tuple, method: str, threads: int) -> np.ndarray:
+    """Whole keystream for an image of shape, row bands generated concurrently"""
+    stream = np.empty(int(np.prod(shape, dtype=np.int64)), dtype=np.uint8)
+
+    def fill(band):
+        start, end = band
+        stream[start:end] = keystream(key, start, end - start, method)
+
+    _run(fill, _bands(shape, threads), threads)
+    return stream
+
+def stream_xor_encrypt(image_array: np.ndarray, key: str, method: str = DEFAULT_METHOD,
+                       out: np.ndarray = None, threads: int = 1) -> np.ndarray:
+    """XOR the image bytes, in C order, with a counter-mode keystream
+
+    A keystream that fits the keystream cache is generated once per
+    (key, shape, method) and reused. Larger ones are generated and
+    applied STREAM_CHUNK bytes at a time, so they are never materialized
+    for the whole image. Pass out=image_array to encrypt in place.
+
+    threads > 1 splits the image into row bands; each thread generates
+    its own slice of the keystream and XORs it into its band.
+    """
+    image_array = _as_uint8(image_array)
+    out = _output(image_array, out)
+    shape = image_array.shape
+    src = np.ascontiguousarray(image_array).reshape(-1)
+    dst = _flat(out)
+
+    stream = KEYSTREAM_CACHE.get(key, shape, np.uint8, method,
+                                 lambda: _build_keystream(key, shape, method, threads))
+    if stream is not None:
+        stream = stream.reshape(-1)
+
+        def xor_band(band):
+            start, end = band
+            np.bitwise_xor(src[start:end], stream[start:end], out=dst[start:end])
+    else:
+        def xor_band(band):
+            for start in range(band[0], band[1], STREAM_CHUNK):
+                end = min(start + STREAM_CHUNK, band[1])
+                np.bitwise_xor(src[start:end], keystream(key, start, end - start, method),
+                               out=dst[start:end])
+
+    _run(xor_band, _bands(shape, threads), threads)
+    return out
+
+def stream_xor_decrypt(encrypted_array: np.ndarray, key: str, method: str = DEFAULT_METHOD,
+                       out: np.ndarray = None, threads: int = 1) -> np.ndarray:
+    """Decrypt stream_xor_encrypt - XOR is symmetric"""
+    return stream_xor_encrypt(encrypted_array, key, method, out, threads)
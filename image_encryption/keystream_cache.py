@@ -0,0 +1,105 @@
+"""
+Process-Wide Keystream Cache
+
+Decrypting the same image again, or encrypting many same-sized frames
+under one key, needs the very same keystream each time. Keystreams are
+cached by (key digest, shape, dtype, method) with LRU eviction under a
+byte budget, so repeated operations skip generation entirely. The
+shared cache is disabled until given a budget.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+# Default memory budget of the shared cache: off until
+# set_keystream_cache_budget() opts in, since entries are full-size
+# keystreams kept for the life of the process
+DEFAULT_CACHE_BYTES = 0
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions entries bytes max_bytes')
+
+class KeystreamCache:
+    """LRU cache of read-only keystream arrays bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, shape: tuple, dtype, method: str, build):
+        """Keystream for (key, shape, dtype, method), calling build() on a miss
+
+        Returns None without building when a keystream of this size
+        cannot fit the budget, so the caller can stream it instead.
+        The returned array is read-only and shared between callers.
+        """
+        shape = tuple(int(n) for n in shape)
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        entry = (hashlib.sha256(key.encode()).digest(), shape, dtype.str, method)
+
+        with self._lock:
+            stream = self._entries.get(entry)
+            if stream is not None:
+                self._entries.move_to_end(entry)
+                self.hits += 1
+                return stream
+            self.misses += 1
+            if nbytes > self.max_bytes:
+                return None
+
+        # Built outside the lock: another thread may build the same entry
+        stream = np.asarray(build(), dtype=dtype).reshape(shape)
+        stream.setflags(write=False)
+        with self._lock:
+            if entry not in self._entries:
+                self._entries[entry] = stream
+                self._bytes += stream.nbytes
+                self._evict(self.max_bytes)
+        return stream
+
+    def _evict(self, max_bytes: int) -> None:
+        """Drop least recently used entries until at most max_bytes remain"""
+        while self._bytes > max_bytes and self._entries:
+            _, stream = self._entries.popitem(last=False)
+            self._bytes -= stream.nbytes
+            self.evictions += 1
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the budget, evicting entries that no longer fit"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict(max_bytes)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Counters and current size"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             len(self._entries), self._bytes, self.max_bytes)
+
+# Shared by every image cipher in the process
+KEYSTREAM_CACHE = KeystreamCache()
+
+def keystream_cache_info() -> CacheInfo:
+    """Hits, misses, evictions, entries, bytes and budget of the shared cache"""
+    return KEYSTREAM_CACHE.info()
+
+def clear_keystream_cache() -> None:
+    """Empty the shared cache"""
+    KEYSTREAM_CACHE.clear()
+
+def set_keystream_cache_budget(max_bytes: int) -> None:
+    """Set the byte budget of the shared cache; 0 disables caching"""
+    KEYSTREAM_CACHE.resize(max_bytes)
@@ -0,0 +1,240 @@
+"""
+Pipelined Batch Image Encryption
+
+Decoding, encryption and PNG encoding each run on their own worker
+threads, connected by bounded queues: while one image is encrypted the
+next is already being decoded and the previous one encoded. PIL, zlib
+and NumPy release the GIL in their heavy loops, so the stages overlap
+and the queues cap how many decoded images are held in memory.
+"""
+import importlib
+import os
+import queue
+import threading
+import time
+from collections import Counter
+import numpy as np
+from PIL import Image
+from .container import CONTAINER_EXTENSION, load_container, write_container
+
+# Modes encrypted as they are; any other mode (P, CMYK, I;16, ...) becomes RGB
+KEPT_MODES = ('RGBA', 'LA', 'L', 'RGB')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp',
+                    CONTAINER_EXTENSION)
+
+# Output format -> file extension
+OUTPUT_FORMATS = {'png': '.png', 'eimg': CONTAINER_EXTENSION}
+
+STAGES = ('decode', 'encrypt', 'encode')
+
+# name -> (module, encrypt, decrypt, whether it takes an out= buffer); the
+# functions are looked up on every call so instrumentation can swap them
+IMAGE_CIPHERS = {
+    'simple_xor': ('chaotic_encryption', 'simple_xor_encrypt', 'simple_xor_decrypt', True),
+    'chaotic': ('chaotic_encryption', 'chaotic_image_encrypt', 'chaotic_image_decrypt', True),
+    'stream': ('keystream', 'stream_xor_encrypt', 'stream_xor_decrypt', False),
+    'permutation_diffusion': ('permutation_diffusion', 'permutation_diffusion_encrypt',
+                              'permutation_diffusion_decrypt', False),
+}
+
+# Marks the end of a queue
+_DONE = object()
+
+def prepare_image(image: Image.Image) -> tuple:
+    """(image, array, original mode) ready for encryption
+
+    Alpha and grayscale modes are kept so they survive the round trip;
+    everything else is converted to RGB.
+    """
+    original_mode = image.mode
+    if image.mode in KEPT_MODES:
+        image.load()
+    else:
+        image = image.convert('RGB')
+    return image, np.array(image), original_mode
+
+def array_to_image(array: np.ndarray) -> Image.Image:
+    """PIL image for an RGBA, RGB, LA or grayscale array"""
+    if len(array.shape) == 3:
+        if array.shape[2] == 4:  # RGBA
+            return Image.fromarray(array, 'RGBA')
+        if array.shape[2] == 2:  # Grayscale with alpha
+            return Image.fromarray(array, 'LA')
+        return Image.fromarray(array, 'RGB')
+    return Image.fromarray(array, 'L')  # Grayscale
+
+def plan_images(src: str, dst: str, extension: str = '.png') -> list:
+    """(input, output) pairs, mirroring a directory tree of images under dst
+
+    Outputs take the given extension. When several images of a folder
+    share a stem (a.jpg and a.png), each keeps its source extension in
+    the output name (a.jpg.png and a.png.png) so none overwrites another.
+    Raises ValueError if two outputs would still share a path.
+    """
+    if not os.path.isdir(src):
+        return [(src, dst)]
+
+    jobs = []
+    seen = {}
+    for root, _, files in os.walk(src):
+        out_dir = os.path.join(dst, os.path.relpath(root, src))
+        images = [name for name in sorted(files)
+                  if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS]
+        stems = Counter(os.path.splitext(name)[0].lower() for name in images)
+        for name in images:
+            stem = os.path.splitext(name)[0]
+            out_name = name if stems[stem.lower()] > 1 else stem
+            in_path = os.path.join(root, name)
+            out_path = os.path.join(out_dir, out_name + extension)
+            # Compare case-insensitively for Windows and macOS file systems
+            other = seen.setdefault(os.path.normcase(out_path).lower(), in_path)
+            if other != in_path:
+                raise ValueError(f"{other} and {in_path} would both be written to {out_path}")
+            jobs.append((in_path, out_path))
+
+    for out_dir in sorted({os.path.dirname(out_path) for _, out_path in jobs}):
+        os.makedirs(out_dir, exist_ok=True)
+    return jobs
+
+def _cipher(name: str, key: str, decrypt: bool):
+    """function(array) -> result array, in place for the XOR ciphers"""
+    try:
+        module, encrypt, decrypt_func, in_place = IMAGE_CIPHERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown image cipher '{name}', "
+                         f"expected one of: {', '.join(IMAGE_CIPHERS)}") from None
+    # By module path: the package re-exports a keystream() that shadows
+    # the keystream submodule
+    module = importlib.import_module(f'.{module}', __package__)
+    func_name = decrypt_func if decrypt else encrypt
+    if in_place:
+        return lambda array: getattr(module, func_name)(array, key, out=array)
+    return lambda array: getattr(module, func_name)(array, key)
+
+def _stage(name: str, func, inbox: queue.Queue, outbox: queue.Queue, downstream: int,
+           state: dict, lock: threading.Lock) -> None:
+    """Worker loop: apply func to every item until the end marker
+
+    Items are (job, payload, error); items that already failed pass
+    straight through. The last worker of a stage to finish sends one
+    end marker per downstream worker.
+    """
+    busy = 0.0
+    while True:
+        item = inbox.get()
+        if item is _DONE:
+            break
+        job, payload, error = item
+        if error is None:
+            start = time.perf_counter()
+            try:
+                payload = func(job, payload)
+            except Exception as e:
+                payload, error = None, e
+            busy += time.perf_counter() - start
+        outbox.put((job, payload, error))
+
+    with lock:
+        state['busy'][name] += busy
+        state['running'][name] -= 1
+        last = state['running'][name] == 0
+    if last:
+        for _ in range(downstream):
+            outbox.put(_DONE)
+
+def run_pipeline(jobs: list, key: str, cipher: str = 'simple_xor', decrypt: bool = False,
+                 workers: int = None, queue_size: int = None, progress=None,
+                 output_format: str = 'png') -> dict:
+    """Encrypt or decrypt (input, output) image files through the pipeline
+
+    workers threads run each stage (CPU count by default) and at most
+    queue_size images (2 * workers by default) wait between two stages.
+    Outputs are written as PNG, or as raw .eimg containers with
+    output_format='eimg', which skips compression entirely. Inputs may
+    be images or containers. progress(done, total, src, error) is called
+    on the calling thread after each image.
+
+    Returns {"images", "failed": [(src, message)], "bytes", "elapsed",
+    "stages": {stage: busy seconds summed over its workers}}.
+    """
+    jobs = list(jobs)
+    transform = _cipher(cipher, key, decrypt)
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', "
+                         f"expected one of: {', '.join(OUTPUT_FORMATS)}")
+    method = '' if decrypt else cipher
+    workers = max(1, workers or os.cpu_count() or 1)
+    queue_size = queue_size or 2 * workers
+
+    def decode(job, _):
+        if job[0].lower().endswith(CONTAINER_EXTENSION):
+            array, header = load_container(job[0], mmap_mode=None)
+            return array, header.mode
+        with Image.open(job[0]) as image:
+            _, array, mode = prepare_image(image)
+        return array, mode
+
+    def encrypt(job, payload):
+        array, mode = payload
+        return transform(array), mode
+
+    def encode(job, payload):
+        array, mode = payload
+        if output_format == 'eimg':
+            write_container(job[1], array, mode, method)
+        else:
+            array_to_image(array).save(job[1], format='PNG')
+        return array.nbytes
+
+    inboxes = [queue.Queue(maxsize=queue_size) for _ in STAGES]
+    results = queue.Queue()
+    lock = threading.Lock()
+    state = {'busy': dict.fromkeys(STAGES, 0.0), 'running': dict.fromkeys(STAGES, workers)}
+
+    threads = []
+    for i, (name, func) in enumerate(zip(STAGES, (decode, encrypt, encode))):
+        last = i == len(STAGES) - 1
+        outbox = results if last else inboxes[i + 1]
+        for _ in range(workers):
+            threads.append(threading.Thread(
+                target=_stage, name=f"{name}-worker",
+                args=(name, func, inboxes[i], outbox, 1 if last else workers, state, lock),
+                daemon=True))
+
+    def feed():
+        for job in jobs:
+            inboxes[0].put((job, None, None))
+        for _ in range(workers):
+            inboxes[0].put(_DONE)
+
+    threads.append(threading.Thread(target=feed, name="pipeline-feeder", daemon=True))
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    done, total_bytes, failed = 0, 0, []
+    while True:
+        item = results.get()
+        if item is _DONE:
+            break
+        (src, _), size, error = item
+        done += 1
+        if error is None:
+            total_bytes += size
+        else:
+            failed.append((src, str(error)))
+        if progress is not None:
+            progress(done, len(jobs), src, error)
+
+    for thread in threads:
+        thread.join()
+
+    return {
+        'images': done - len(failed),
+        'failed': failed,
+        'bytes': total_bytes,
+        'elapsed': time.perf_counter() - start,
+        'stages': dict(state['busy']),
+    }
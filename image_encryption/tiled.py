@@ -0,0 +1,114 @@
+"""
+Memory-Mapped Tiled Image Encryption
+
+Encrypts images that live in np.memmap arrays, .npy files, .eimg
+containers or raw pixel files one band of rows at a time. Each band takes its keystream from its
+own byte offset, so the result is bit-identical to encrypting the whole
+image at once while memory stays proportional to the band size.
+"""
+import numpy as np
+from .chaotic_encryption import _flat, _run
+from .container import CONTAINER_EXTENSION, create_container, load_container, read_file_header
+from .keystream import DEFAULT_METHOD, keystream
+
+# Default amount of pixel data processed per band
+BAND_BYTES = 1 << 24
+
+def band_rows(shape: tuple, band_bytes: int = BAND_BYTES) -> int:
+    """Rows per band so that one band holds about band_bytes bytes"""
+    row_bytes = int(np.prod(shape[1:], dtype=np.int64)) if len(shape) > 1 else 1
+    return max(1, band_bytes // max(row_bytes, 1))
+
+def bands(shape: tuple, band_bytes: int = BAND_BYTES):
+    """Yield (first row, end row) of each band of an image of shape"""
+    height = shape[0] if shape else 0
+    step = band_rows(shape, band_bytes)
+    for r0 in range(0, height, step):
+        yield r0, min(r0 + step, height)
+
+def xor_band(src: np.ndarray, dst: np.ndarray, key: str, r0: int, r1: int,
+             method: str = DEFAULT_METHOD) -> None:
+    """XOR rows [r0, r1) of src into dst with the keystream at their offset"""
+    row_bytes = src[0].size if src.ndim > 1 else 1
+    data = np.ascontiguousarray(src[r0:r1]).reshape(-1)
+    stream = keystream(key, r0 * row_bytes, data.size, method)
+    np.bitwise_xor(data, stream, out=_flat(dst[r0:r1]))
+
+def tiled_xor_encrypt(src: np.ndarray, key: str, out: np.ndarray = None,
+                      method: str = DEFAULT_METHOD, band_bytes: int = BAND_BYTES,
+                      threads: int = 1) -> np.ndarray:
+    """Encrypt a (possibly memory-mapped) uint8 image band by band
+
+    out may be src itself, another memmap, or None for a new array.
+    The result equals stream_xor_encrypt(src, key, method). With
+    threads > 1 up to that many bands are in flight at once.
+    """
+    if src.dtype != np.uint8:
+        raise ValueError("Tiled encryption works on uint8 images")
+    if out is None:
+        out = np.empty(src.shape, dtype=np.uint8)
+    elif out.shape != src.shape or out.dtype != np.uint8:
+        raise ValueError(f"out must be a uint8 array of shape {src.shape}")
+
+    _run(lambda band: xor_band(src, out, key, band[0], band[1], method),
+         bands(src.shape, band_bytes), threads)
+    return out
+
+def tiled_xor_decrypt(src: np.ndarray, key: str, out: np.ndarray = None,
+                      method: str = DEFAULT_METHOD, band_bytes: int = BAND_BYTES,
+                      threads: int = 1) -> np.ndarray:
+    """Decrypt tiled_xor_encrypt - XOR is symmetric"""
+    return tiled_xor_encrypt(src, key, out, method, band_bytes, threads)
+
+def open_image_file(path: str, shape: tuple = None, mode: str = 'r') -> np.ndarray:
+    """Memory-map a .npy or .eimg file, or a raw uint8 pixel file of the given shape"""
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode=mode)
+    if path.endswith(CONTAINER_EXTENSION):
+        return load_container(path, mode)[0]
+    if shape is None:
+        raise ValueError("Raw pixel files need an explicit shape")
+    return np.memmap(path, dtype=np.uint8, mode=mode, shape=tuple(shape))
+
+def create_image_file(path: str, shape: tuple, image_mode: str = None,
+                      method: str = '') -> np.ndarray:
+    """Create a writable memory-mapped .npy, .eimg or raw uint8 file of shape
+
+    image_mode and method are recorded in .eimg container headers.
+    """
+    if path.endswith('.npy'):
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=tuple(shape))
+    if path.endswith(CONTAINER_EXTENSION):
+        return create_container(path, shape, np.uint8, image_mode, method)
+    return np.memmap(path, dtype=np.uint8, mode='w+', shape=tuple(shape))
+
+def _transform_file(src_path: str, dst_path: str, key: str, shape: tuple, method: str,
+                    band_bytes: int, threads: int, decrypt: bool) -> tuple:
+    """XOR src_path into dst_path band by band, returning the image shape"""
+    src = open_image_file(src_path, shape)
+    image_mode = None
+    if src_path.endswith(CONTAINER_EXTENSION):
+        image_mode = read_file_header(src_path).mode
+    dst = create_image_file(dst_path, src.shape, image_mode, '' if decrypt else method)
+    try:
+        tiled_xor_encrypt(src, key, dst, method, band_bytes, threads)
+        dst.flush()
+    finally:
+        del dst
+    return src.shape
+
+def tiled_encrypt_file(src_path: str, dst_path: str, key: str, shape: tuple = None,
+                       method: str = DEFAULT_METHOD, band_bytes: int = BAND_BYTES,
+                       threads: int = 1) -> tuple:
+    """Encrypt an image file into dst_path without loading it into memory
+
+    Both files may be .npy, .eimg or raw pixels (raw needs shape).
+    Returns the image shape.
+    """
+    return _transform_file(src_path, dst_path, key, shape, method, band_bytes, threads, False)
+
+def tiled_decrypt_file(src_path: str, dst_path: str, key: str, shape: tuple = None,
+                       method: str = DEFAULT_METHOD, band_bytes: int = BAND_BYTES,
+                       threads: int = 1) -> tuple:
+    """Decrypt a file written by tiled_encrypt_file - XOR is symmetric"""
+    return _transform_file(src_path, dst_path, key, shape, method, band_bytes, threads, True)
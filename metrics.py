@@ -0,0 +1,276 @@
+"""
+Opt-in instrumentation for the cipher hot paths
+
+When enabled, the public *_encrypt/*_decrypt functions of text_encryption
+and image_encryption, and the encrypt/decrypt methods of the cipher
+classes, are swapped for wrappers that record call counts, bytes
+processed and a latency histogram per algorithm and direction. When
+disabled the original functions are put back, so there is no overhead
+at all. Set ENCRYPTION_METRICS=1 to enable at import time.
+"""
+import importlib
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Cipher class -> algorithm label, by module
+_CIPHER_CLASSES = {
+    'text_encryption.transposition': {'Transposition': 'transposition'},
+    'text_encryption.caesar': {'Caesar': 'caesar'},
+    'text_encryption.affine': {'Affine': 'affine'},
+    'text_encryption.hill': {'Hill': 'hill'},
+    'text_encryption.vigenere': {'Vigenere': 'vigenere'},
+    'text_encryption.des': {'SimplifiedDES': 'des'},
+    'text_encryption.aes': {'SimplifiedAES': 'aes', 'AESCTR': 'aes_ctr', 'AESGCM': 'aes_gcm'},
+}
+
+# Image cipher functions, by module
+_IMAGE_FUNCTIONS = {
+    'image_encryption.chaotic_encryption': ('chaotic_image_encrypt', 'chaotic_image_decrypt',
+                                            'simple_xor_encrypt', 'simple_xor_decrypt'),
+    'image_encryption.keystream': ('stream_xor_encrypt', 'stream_xor_decrypt'),
+    'image_encryption.tiled': ('tiled_xor_encrypt', 'tiled_xor_decrypt'),
+    'image_encryption.permutation_diffusion': ('permutation_diffusion_encrypt',
+                                               'permutation_diffusion_decrypt'),
+}
+
+class _Series:
+    """Counters and latency histogram of one (algorithm, direction)"""
+    __slots__ = ('calls', 'errors', 'bytes', 'latency_sum', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        # One count per bucket plus the +Inf overflow
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, size: int, seconds: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.bytes += size
+        self.latency_sum += seconds
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+_lock = threading.Lock()
+_series = {}
+_patched = []  # (owner, attribute, original or None if not in owner.__dict__)
+_local = threading.local()
+
+def _payload_size(data) -> int:
+    """Bytes in a cipher input: str (as UTF-8), bytes or NumPy array"""
+    if isinstance(data, str):
+        return len(data) if data.isascii() else len(data.encode('utf-8', 'surrogatepass'))
+    nbytes = getattr(data, 'nbytes', None)
+    if nbytes is not None:
+        return nbytes
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+def _instrument(func, algorithm: str, direction: str, payload: int):
+    """Wrap func, recording args[payload] as the input
+
+    Only the outermost instrumented call is recorded, so a function
+    delegating to an instrumented method is not counted twice.
+    """
+    key = (algorithm, direction)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, 'active', False):
+            return func(*args, **kwargs)
+        _local.active = True
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            _local.active = False
+            size = _payload_size(args[payload]) if len(args) > payload else 0
+            with _lock:
+                series = _series.get(key)
+                if series is None:
+                    series = _series[key] = _Series()
+                series.observe(size, elapsed, failed)
+
+    wrapper.__wrapped_metrics__ = True
+    return wrapper
+
+def _split_name(name: str):
+    """'aes_gcm_encrypt' -> ('aes_gcm', 'encrypt'), None for other names"""
+    for direction in ('encrypt', 'decrypt'):
+        if name.endswith('_' + direction):
+            return name[:-len(direction) - 1], direction
+    return None
+
+def _targets():
+    """(owner objects, attribute, algorithm, direction, payload index) to wrap"""
+    import text_encryption
+    import image_encryption
+
+    for name in text_encryption.__all__:
+        split = _split_name(name)
+        if split is None:
+            continue
+        module = importlib.import_module(f'text_encryption.{text_encryption._LOCATIONS[name]}')
+        yield (module, text_encryption), name, split[0], split[1], 0
+
+    for module_name, names in _IMAGE_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            algorithm, direction = _split_name(name)
+            yield (module, image_encryption), name, algorithm, direction, 0
+
+    for module_name, classes in _CIPHER_CLASSES.items():
+        module = importlib.import_module(module_name)
+        for class_name, algorithm in classes.items():
+            cls = getattr(module, class_name)
+            for direction in ('encrypt', 'decrypt'):
+                yield (cls,), direction, algorithm, direction, 1
+
+def enable() -> None:
+    """Start recording metrics (idempotent)"""
+    with _lock:
+        if _patched:
+            return
+        for owners, attribute, algorithm, direction, payload in _targets():
+            original = getattr(owners[0], attribute)
+            wrapper = _instrument(original, algorithm, direction, payload)
+            for owner in owners:
+                _patched.append((owner, attribute, owner.__dict__.get(attribute)))
+                setattr(owner, attribute, wrapper)
+
+def disable() -> None:
+    """Stop recording and restore the original functions"""
+    with _lock:
+        for owner, attribute, original in reversed(_patched):
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        _patched.clear()
+
+def is_enabled() -> bool:
+    """Whether the cipher functions are currently instrumented"""
+    return bool(_patched)
+
+def reset() -> None:
+    """Drop everything recorded so far"""
+    with _lock:
+        _series.clear()
+
+def snapshot() -> dict:
+    """Copy of all metrics recorded so far
+
+    Returns {"enabled": bool, "series": [...]} with one entry per
+    (algorithm, direction): calls, errors, bytes, latency_sum (seconds)
+    and cumulative histogram counts keyed by bucket upper bound.
+    """
+    with _lock:
+        series = []
+        for (algorithm, direction), s in sorted(_series.items()):
+            cumulative, running = {}, 0
+            for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), s.buckets):
+                running += count
+                cumulative[bound] = running
+            series.append({
+                'algorithm': algorithm, 'direction': direction,
+                'calls': s.calls, 'errors': s.errors, 'bytes': s.bytes,
+                'latency_sum': s.latency_sum, 'buckets': cumulative,
+            })
+    return {'enabled': is_enabled(), 'series': series}
+
+def latency_quantile(entry: dict, q: float) -> float:
+    """Estimate a latency quantile of a snapshot entry (bucket upper bound)"""
+    target = q * entry['calls']
+    for bound, count in entry['buckets'].items():
+        if count >= target:
+            return bound
+    return float('inf')
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    series = snapshot()['series']
+    lines = []
+
+    def counter(name: str, help_text: str, field: str):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for s in series:
+            lines.append(f'{name}{{algorithm="{s["algorithm"]}",direction="{s["direction"]}"}} {s[field]}')
+
+    counter('cipher_calls_total', 'Cipher function calls.', 'calls')
+    counter('cipher_errors_total', 'Cipher function calls that raised.', 'errors')
+    counter('cipher_bytes_total', 'Input bytes processed.', 'bytes')
+
+    name = 'cipher_latency_seconds'
+    lines.append(f'# HELP {name} Cipher function latency.')
+    lines.append(f'# TYPE {name} histogram')
+    for s in series:
+        labels = f'algorithm="{s["algorithm"]}",direction="{s["direction"]}"'
+        for bound, count in s['buckets'].items():
+            lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {count}')
+        lines.append(f'{name}_sum{{{labels}}} {s["latency_sum"]}')
+        lines.append(f'{name}_count{{{labels}}} {s["calls"]}')
+
+    return '\n'.join(lines) + '\n'
+
+def _toggle_from_session() -> None:
+    """Checkbox callback: enable or disable to match the session's checkbox"""
+    import streamlit as st
+
+    if st.session_state.metrics_enabled:
+        enable()
+    else:
+        disable()
+
+def sidebar_panel() -> None:
+    """Streamlit sidebar panel to toggle, inspect and export the metrics"""
+    import streamlit as st
+
+    with st.sidebar.expander("Cipher Metrics", expanded=False):
+        # The checkbox mirrors the process-wide state and only a real
+        # toggle changes it; Streamlit reruns the page after the callback,
+        # so pages re-import the swapped functions.
+        st.session_state.metrics_enabled = is_enabled()
+        st.checkbox("Collect metrics", key="metrics_enabled", on_change=_toggle_from_session,
+                    help="Instruments the cipher functions for the whole server process")
+
+        series = snapshot()['series']
+        if not series:
+            st.caption("No cipher calls recorded yet.")
+            return
+
+        st.dataframe([{
+            'algorithm': s['algorithm'], 'direction': s['direction'],
+            'calls': s['calls'], 'errors': s['errors'],
+            'MB': round(s['bytes'] / (1 << 20), 3),
+            'mean ms': round(1000 * s['latency_sum'] / s['calls'], 3),
+            'p95 ms <=': 1000 * latency_quantile(s, 0.95),
+        } for s in series], hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Prometheus", prometheus_text(), file_name="cipher_metrics.prom",
+                               mime="text/plain")
+        with col2:
+            if st.button("Reset", key="metrics_reset"):
+                reset()
+                st.rerun()
+
+if os.environ.get('ENCRYPTION_METRICS', '').lower() in ('1', 'true', 'yes'):
+    enable()
@@ -4,8 +4,67 @@ Image Encryption Page - SIMPLE & RELIABLE
 import streamlit as st
 import numpy as np
 from PIL import Image
+import hashlib
 import io
-from image_encryption import simple_xor_encrypt, simple_xor_decrypt
+from image_encryption import simple_xor_encrypt, simple_xor_decrypt, prepare_image, array_to_image
+from image_encryption import CONTAINER_EXTENSION, CONTAINER_MIME, is_container, pack_container, unpack_container
+from metrics import sidebar_panel
+
+# ============================================
+# CACHED STEPS
+# ============================================
+# Every widget interaction reruns this page. Decoding, XOR and PNG
+# encoding are cached on a content hash of their input plus the key;
+# the arrays themselves are passed unhashed (leading underscore).
+CACHE_TTL = 3600  # seconds
+CACHE_ENTRIES = 8
+
+# Encrypted pixels are noise, so the raw container skips PNG's pointless compression
+PNG_FORMAT = "PNG"
+RAW_FORMAT = f"Raw container ({CONTAINER_EXTENSION})"
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest identifying an upload"""
+    return hashlib.sha256(data).hexdigest()
+
+def derived_hash(digest: str, key: str, decrypt: bool) -> str:
+    """Content hash of the result of XORing the input digest with key"""
+    tag = "dec" if decrypt else "enc"
+    return content_hash(f"{digest}\0{key}\0{tag}".encode())
+
+@st.cache_data(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def decode_upload(digest: str, _data: bytes) -> tuple:
+    """Decode an uploaded image or raw container: (image, array, original mode)
+
+    Alpha and grayscale modes are kept, everything else becomes RGB
+    (the same rules as the batch pipeline).
+    """
+    if is_container(_data):
+        # Zero-copy view of the uploaded bytes
+        array, header = unpack_container(_data)
+        return array_to_image(array), array, header.mode
+    return prepare_image(Image.open(io.BytesIO(_data)))
+
+@st.cache_data(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def xor_image(digest: str, key: str, decrypt: bool, _array: np.ndarray) -> np.ndarray:
+    """Encrypt or decrypt an image array, once per (content, key)"""
+    # XOR lands directly in the result buffer: the output is uint8 by
+    # construction, so no clip or cast copies are needed
+    out = np.empty(_array.shape, dtype=np.uint8)
+    xor = simple_xor_decrypt if decrypt else simple_xor_encrypt
+    return xor(_array, key, out=out)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def encode_png(digest: str, _image: Image.Image) -> bytes:
+    """PNG bytes of an image, once per content hash"""
+    buf = io.BytesIO()
+    _image.save(buf, format='PNG')
+    return buf.getvalue()
+
+@st.cache_data(max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def encode_container(digest: str, mode: str, _array: np.ndarray) -> bytes:
+    """Raw container bytes of an encrypted array, once per content hash"""
+    return pack_container(_array, mode, method="simple_xor")
 
 # Clean CSS
 st.markdown("""
@@ -54,6 +113,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 st.title("Image Encryption")
+sidebar_panel()
 st.markdown("Encrypt and decrypt images using XOR-based encryption with SHA-256 key hashing.")
 st.markdown("---")
 
@@ -67,24 +127,10 @@ uploaded_file = st.file_uploader(
 
 if uploaded_file is not None:
     try:
-        # Load image
-        image = Image.open(uploaded_file)
-        
-        # Store original mode for later restoration
-        original_mode = image.mode
-        
-        # Convert image to appropriate format
-        if image.mode in ['RGBA', 'LA']:
-            # Keep alpha channel
-            image_array = np.array(image)
-        elif image.mode == 'P':
-            image = image.convert('RGB')
-            image_array = np.array(image)
-        elif image.mode == 'L':
-            image_array = np.array(image)
-        else:
-            image = image.convert('RGB')
-            image_array = np.array(image)
+        # Load image (cached on the upload's content hash)
+        upload_bytes = uploaded_file.getvalue()
+        upload_digest = content_hash(upload_bytes)
+        image, image_array, original_mode = decode_upload(upload_digest, upload_bytes)
         
         # Display original image
         st.markdown('<div class="section-box">', unsafe_allow_html=True)
@@ -111,24 +157,20 @@ if uploaded_file is not None:
         enc_key = st.text_input("**Encryption Key:**", "MySecretKey123", 
                                help="Enter a secret key for encryption")
         
+        download_format = st.radio("**Download Format:**", [PNG_FORMAT, RAW_FORMAT], horizontal=True,
+                                   help="The raw container stores the pixels uncompressed: much faster "
+                                        "to save and load than PNG, and no larger for encrypted images")
+        
         if st.button("**Encrypt Image**", use_container_width=True, type="primary"):
             if enc_key:
                 with st.spinner("Encrypting image..."):
                     try:
                         # Encrypt the image
-                        encrypted_array = simple_xor_encrypt(image_array, enc_key)
-                        
-                        # Ensure values are within 0-255 range
-                        encrypted_array = np.clip(encrypted_array, 0, 255).astype(np.uint8)
+                        encrypted_array = xor_image(upload_digest, enc_key, False, image_array)
+                        encrypted_digest = derived_hash(upload_digest, enc_key, False)
                         
                         # Convert to PIL Image
-                        if len(encrypted_array.shape) == 3:
-                            if encrypted_array.shape[2] == 4:  # RGBA
-                                encrypted_image = Image.fromarray(encrypted_array, 'RGBA')
-                            else:  # RGB
-                                encrypted_image = Image.fromarray(encrypted_array, 'RGB')
-                        else:  # Grayscale
-                            encrypted_image = Image.fromarray(encrypted_array, 'L')
+                        encrypted_image = array_to_image(encrypted_array)
                         
                         # Display encrypted image
                         st.markdown("**Encrypted Image:**")
@@ -147,12 +189,16 @@ if uploaded_file is not None:
                             st.write(f"- **Unique Pixel Values:** {unique_values}")
                         
                         # Save to bytes for download
-                        buf = io.BytesIO()
-                        encrypted_image.save(buf, format='PNG')
-                        encrypted_bytes = buf.getvalue()
+                        if download_format == RAW_FORMAT:
+                            encrypted_bytes = encode_container(encrypted_digest, original_mode, encrypted_array)
+                            file_name, mime = f"encrypted_image{CONTAINER_EXTENSION}", CONTAINER_MIME
+                        else:
+                            encrypted_bytes = encode_png(encrypted_digest, encrypted_image)
+                            file_name, mime = "encrypted_image.png", "image/png"
                         
                         # Store in session for decryption
                         st.session_state.encrypted_array = encrypted_array
+                        st.session_state.encrypted_digest = encrypted_digest
                         st.session_state.encrypted_image = encrypted_image
                         st.session_state.encryption_key = enc_key
                         st.session_state.original_array = image_array
@@ -161,8 +207,8 @@ if uploaded_file is not None:
                         st.download_button(
                             label="**Download Encrypted Image**",
                             data=encrypted_bytes,
-                            file_name="encrypted_image.png",
-                            mime="image/png",
+                            file_name=file_name,
+                            mime=mime,
                             use_container_width=True
                         )
                         
@@ -201,19 +247,13 @@ if 'encrypted_array' in st.session_state:
             with st.spinner("Decrypting image..."):
                 try:
                     # Decrypt the image
-                    decrypted_array = simple_xor_decrypt(st.session_state.encrypted_array, dec_key)
-                    
-                    # Ensure values are within 0-255 range
-                    decrypted_array = np.clip(decrypted_array, 0, 255).astype(np.uint8)
+                    encrypted_digest = st.session_state.encrypted_digest
+                    decrypted_array = xor_image(encrypted_digest, dec_key, True,
+                                                st.session_state.encrypted_array)
+                    decrypted_digest = derived_hash(encrypted_digest, dec_key, True)
                     
                     # Convert to PIL Image
-                    if len(decrypted_array.shape) == 3:
-                        if decrypted_array.shape[2] == 4:
-                            decrypted_image = Image.fromarray(decrypted_array, 'RGBA')
-                        else:
-                            decrypted_image = Image.fromarray(decrypted_array, 'RGB')
-                    else:
-                        decrypted_image = Image.fromarray(decrypted_array, 'L')
+                    decrypted_image = array_to_image(decrypted_array)
                     
                     # Display results
                     st.markdown("**Decryption Results:**")
@@ -256,9 +296,7 @@ if 'encrypted_array' in st.session_state:
                                     st.image(diff_image, caption="Difference (amplified 50x)", width=300)
                     
                     # Save decrypted image
-                    buf = io.BytesIO()
-                    decrypted_image.save(buf, format='PNG')
-                    decrypted_bytes = buf.getvalue()
+                    decrypted_bytes = encode_png(decrypted_digest, decrypted_image)
                     
                     st.download_button(
                         label="**Download Decrypted Image**",
@@ -283,14 +321,15 @@ st.markdown("#### Upload Encrypted Image")
 
 uploaded_encrypted = st.file_uploader(
     "Or upload an encrypted image",
-    type=['png', 'jpg', 'jpeg'],
+    type=['png', 'jpg', 'jpeg', CONTAINER_EXTENSION.lstrip('.')],
     key="encrypted_upload"
 )
 
 if uploaded_encrypted:
     try:
-        encrypted_img = Image.open(uploaded_encrypted)
-        encrypted_arr = np.array(encrypted_img)
+        encrypted_upload = uploaded_encrypted.getvalue()
+        encrypted_upload_digest = content_hash(encrypted_upload)
+        encrypted_img, encrypted_arr, _ = decode_upload(encrypted_upload_digest, encrypted_upload)
         
         st.markdown("**Uploaded Encrypted Image:**")
         st.image(encrypted_img, width=200)
@@ -302,17 +341,11 @@ if uploaded_encrypted:
             if upload_dec_key:
                 with st.spinner("Decrypting uploaded image..."):
                     try:
-                        decrypted_array = simple_xor_decrypt(encrypted_arr, upload_dec_key)
-                        decrypted_array = np.clip(decrypted_array, 0, 255).astype(np.uint8)
+                        decrypted_array = xor_image(encrypted_upload_digest, upload_dec_key, True, encrypted_arr)
+                        decrypted_digest = derived_hash(encrypted_upload_digest, upload_dec_key, True)
                         
                         # Convert to PIL Image
-                        if len(decrypted_array.shape) == 3:
-                            if decrypted_array.shape[2] == 4:
-                                decrypted_image = Image.fromarray(decrypted_array, 'RGBA')
-                            else:
-                                decrypted_image = Image.fromarray(decrypted_array, 'RGB')
-                        else:
-                            decrypted_image = Image.fromarray(decrypted_array, 'L')
+                        decrypted_image = array_to_image(decrypted_array)
                         
                         # Display
                         col_up1, col_up2 = st.columns(2)
@@ -324,9 +357,7 @@ if uploaded_encrypted:
                             st.image(decrypted_image, use_column_width=True, caption="Decrypted")
                         
                         # Download
-                        buf = io.BytesIO()
-                        decrypted_image.save(buf, format='PNG')
-                        decrypted_bytes = buf.getvalue()
+                        decrypted_bytes = encode_png(decrypted_digest, decrypted_image)
                         
                         st.download_button(
                             label="**Download Decrypted Image**",
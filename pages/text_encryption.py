@@ -2,17 +2,27 @@
 Text Encryption Page - CLEAN DESIGN FOR ALL ALGORITHMS
 """
 import streamlit as st
+from metrics import sidebar_panel
 from text_encryption import (
     transposition_encrypt, transposition_decrypt,
     caesar_encrypt, caesar_decrypt,
     affine_encrypt, affine_decrypt,
-    hill_encrypt, hill_decrypt, is_valid_hill_key,
+    Hill,
     vigenere_encrypt, vigenere_decrypt,
     des_encrypt, des_decrypt,
     aes_encrypt, aes_decrypt,
-    rsa_encrypt, rsa_decrypt, rsa_generate_keys
+    aes_gcm_encrypt, aes_gcm_decrypt,
+    rsa_encrypt, rsa_decrypt, rsa_generate_keys_async
 )
 
+# Every widget interaction reruns this page, so key schedules are kept
+CACHE_TTL = 3600  # seconds
+
+@st.cache_resource(max_entries=64, ttl=CACHE_TTL, show_spinner=False)
+def hill_cipher(key_matrix: tuple) -> Hill:
+    """Hill cipher with its inverse matrix, built once per key"""
+    return Hill(key_matrix)
+
 # Clean, minimal CSS
 st.markdown("""
 <style>
@@ -100,6 +110,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 st.title("Text Encryption")
+sidebar_panel()
 st.markdown("Select an encryption algorithm from the dropdown below.")
 st.markdown("---")
 
@@ -112,6 +123,7 @@ algorithms = {
     "Vigenere Cipher": {"desc": "Keyword encryption"},
     "DES (Simplified)": {"desc": "Block cipher"},
     "AES (Simplified)": {"desc": "Advanced encryption"},
+    "AES-GCM": {"desc": "Authenticated encryption (AES-NI)"},
     "RSA (Simplified)": {"desc": "Public-key encryption"}
 }
 
@@ -183,7 +195,8 @@ if selected_algo == "Hill Cipher":
             key_matrix = [[a11, a12, a13], [a21, a22, a23], [a31, a32, a33]]
         
         # Matrix validation
-        if is_valid_hill_key(key_matrix):
+        hill = hill_cipher(tuple(tuple(row) for row in key_matrix))
+        if hill.is_valid:
             st.markdown('<div class="success-msg">✓ Valid matrix</div>', unsafe_allow_html=True)
         else:
             st.markdown('<div class="error-msg">✗ Invalid matrix determinant</div>', unsafe_allow_html=True)
@@ -193,9 +206,9 @@ if selected_algo == "Hill Cipher":
         # Encrypt button
         if st.button("**Encrypt**", key="enc_hill", use_container_width=True):
             if input_text:
-                if is_valid_hill_key(key_matrix):
+                if hill.is_valid:
                     with st.spinner("Encrypting..."):
-                        encrypted = hill_encrypt(input_text, key_matrix)
+                        encrypted = hill.encrypt(input_text)
                         st.session_state.hill_encrypted = encrypted
                         st.markdown("**Encrypted Text:**")
                         st.code(encrypted)
@@ -223,9 +236,9 @@ if selected_algo == "Hill Cipher":
         # Decrypt button
         if st.button("**Decrypt**", key="dec_hill", use_container_width=True):
             if cipher_text:
-                if is_valid_hill_key(key_matrix):
+                if hill.is_valid:
                     with st.spinner("Decrypting..."):
-                        decrypted = hill_decrypt(cipher_text, key_matrix)
+                        decrypted = hill.decrypt(cipher_text)
                         if "Error:" in decrypted:
                             st.error(decrypted)
                         else:
@@ -436,6 +449,40 @@ elif selected_algo == "AES (Simplified)":
                     st.error("Invalid cipher text format. Please enter valid hexadecimal.")
         st.markdown('</div>', unsafe_allow_html=True)
 
+# ============================================
+# AES-GCM - Clean Design
+# ============================================
+elif selected_algo == "AES-GCM":
+    
+    with col1:
+        st.markdown('<div class="section-container">', unsafe_allow_html=True)
+        st.markdown("### Encryption")
+        input_text = st.text_area("**Plain Text:**", height=120)
+        key = st.text_input("**Key:**", "AESKEY1234567890")
+        
+        if st.button("**Encrypt**", key="enc_aes_gcm"):
+            if input_text:
+                encrypted = aes_gcm_encrypt(input_text, key)
+                st.markdown("**Encrypted Text (Hex):**")
+                st.code(encrypted)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="section-container">', unsafe_allow_html=True)
+        st.markdown("### Decryption")
+        cipher_hex = st.text_area("**Cipher Text (Hex):**", height=120, key="dec_aes_gcm_cipher")
+        key = st.text_input("**Key:**", "AESKEY1234567890", key="dec_aes_gcm_key")
+        
+        if st.button("**Decrypt**", key="dec_aes_gcm"):
+            if cipher_hex:
+                try:
+                    decrypted = aes_gcm_decrypt(cipher_hex, key)
+                    st.markdown("**Decrypted Text:**")
+                    st.code(decrypted)
+                except ValueError:
+                    st.error("Decryption failed: wrong key, or the cipher text is not valid hexadecimal or was modified.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
 # ============================================
 # RSA (SIMPLIFIED) - Clean Design
 # ============================================
@@ -446,30 +493,45 @@ elif selected_algo == "RSA (Simplified)":
         st.markdown("### Encryption")
         input_text = st.text_area("**Plain Text:**", height=120)
         
-        # Generate keys if not exists
-        if 'rsa_keys' not in st.session_state:
-            st.session_state.rsa_keys = rsa_generate_keys()
-        
-        public_key, private_key = st.session_state.rsa_keys
+        key_bits = st.selectbox("**Key Size (bits):**", [1024, 2048, 3072, 4096], index=1)
         
-        st.markdown(f"**Public Key:** `{public_key}`")
-        st.markdown(f"**Private Key:** `{private_key}`")
+        # Generate keys in the background so the page keeps rendering
+        if st.session_state.get('rsa_key_bits') != key_bits:
+            pending = st.session_state.get('rsa_keygen')
+            if pending is None or pending[0] != key_bits:
+                st.session_state.rsa_keygen = (key_bits, rsa_generate_keys_async(key_bits))
+            elif pending[1].done():
+                st.session_state.rsa_keys = pending[1].result()
+                st.session_state.rsa_key_bits = key_bits
+                del st.session_state.rsa_keygen
         
-        if st.button("**Encrypt**", key="enc_rsa"):
-            if input_text:
-                encrypted = rsa_encrypt(input_text, public_key)
-                st.markdown("**Encrypted Text:**")
-                st.code(encrypted)
+        if st.session_state.get('rsa_key_bits') == key_bits:
+            public_key, private_key = st.session_state.rsa_keys
+            
+            st.markdown(f"**Public Key:** `{public_key}`")
+            st.markdown(f"**Private Key:** `{tuple(private_key[:2])}`")
+            
+            packed = st.checkbox("Pack into blocks (Base64)", value=True,
+                                 help="One RSA operation per block instead of per character")
+            
+            if st.button("**Encrypt**", key="enc_rsa"):
+                if input_text:
+                    encrypted = rsa_encrypt(input_text, public_key, packed=packed)
+                    st.markdown("**Encrypted Text:**")
+                    st.code(encrypted)
+        else:
+            st.info(f"Generating a {key_bits}-bit key pair in the background...")
+            st.button("**Refresh**", key="refresh_rsa")
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="section-container">', unsafe_allow_html=True)
         st.markdown("### Decryption")
-        cipher_text = st.text_area("**Cipher Text (comma-separated):**", 
+        cipher_text = st.text_area("**Cipher Text (Base64 or comma-separated):**", 
                                   height=120, key="dec_rsa_cipher",
-                                  placeholder="Enter numbers separated by commas...")
+                                  placeholder="Enter Base64 blocks or numbers separated by commas...")
         
-        if 'rsa_keys' in st.session_state:
+        if st.session_state.get('rsa_key_bits') == key_bits:
             _, private_key = st.session_state.rsa_keys
             
             if st.button("**Decrypt**", key="dec_rsa"):
@@ -479,7 +541,7 @@ elif selected_algo == "RSA (Simplified)":
                         st.markdown("**Decrypted Text:**")
                         st.code(decrypted)
                     except:
-                        st.error("Invalid cipher text format. Please enter comma-separated numbers.")
+                        st.error("Invalid cipher text format. Please enter Base64 blocks or comma-separated numbers.")
         st.markdown('</div>', unsafe_allow_html=True)
 
 # ============================================
@@ -596,11 +658,26 @@ with st.expander(f"About {selected_algo}", expanded=True):
         - For educational purposes only
         """)
         
+    elif selected_algo == "AES-GCM":
+        st.markdown("""
+        **AES-GCM** is AES in Galois/Counter Mode, a standard authenticated encryption scheme.
+        
+        **This Implementation:**
+        - Real AES from pycryptodome, using AES-NI where the CPU supports it
+        - 256-bit key derived from the passphrase with scrypt and a random 16-byte salt
+        - Random 96-bit nonce and 128-bit authentication tag
+        - Cipher text format (hex): salt || nonce || cipher text || tag
+        - Tampered cipher text or a wrong key is detected and rejected
+        """)
+        
     elif selected_algo == "RSA (Simplified)":
         st.markdown("""
         **RSA (Rivest-Shamir-Adleman)** is a public-key cryptosystem.
         
-        **Note:** This implementation uses small primes for demonstration.
+        **Note:** Keys are generated with Miller-Rabin tested random primes, and
+        decryption uses the Chinese Remainder Theorem (dP, dQ, qInv). Characters
+        are encrypted one at a time, or packed with PKCS#1 v1.5 padding into
+        modulus-sized blocks and encoded as Base64.
         
         **How RSA Works:**
         1. Choose two prime numbers p and q
@@ -0,0 +1,127 @@
+"""
+Equivalence tests: NumPy Vigenere/DES against the original loop implementations
+"""
+import random
+import pytest
+import text_encryption
+from text_encryption.vectorized import (des_decrypt_np, des_encrypt_np,
+                                        vigenere_decrypt_np, vigenere_encrypt_np)
+
+# Mixed ASCII and non-ASCII characters, including letters outside A-Z
+ALPHABET = ("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+            "0123456789 .,;:!?-_\n\téèàçÉßøÆΩπЖж中文字😀")
+
+# The per-character loops the vectorized engine replaced, kept verbatim
+# as the oracle since the library versions have since been rewritten
+
+def caesar_encrypt(text: str, shift: int) -> str:
+    """Caesar cipher encryption"""
+    result = ""
+    for char in text:
+        if char.isupper():
+            result += chr((ord(char) + shift - 65) % 26 + 65)
+        elif char.islower():
+            result += chr((ord(char) + shift - 97) % 26 + 97)
+        else:
+            result += char
+    return result
+
+def caesar_decrypt(cipher: str, shift: int) -> str:
+    """Caesar cipher decryption"""
+    return caesar_encrypt(cipher, -shift)
+
+def vigenere_encrypt(text: str, key: str) -> str:
+    """Vigenere cipher encryption"""
+    key = key.upper()
+    key_len = len(key)
+    result = ""
+
+    for i, char in enumerate(text):
+        if char.isupper():
+            shift = ord(key[i % key_len]) - 65
+            result += chr((ord(char) + shift - 65) % 26 + 65)
+        elif char.islower():
+            shift = ord(key[i % key_len].lower()) - 97
+            result += chr((ord(char) + shift - 97) % 26 + 97)
+        else:
+            result += char
+
+    return result
+
+def vigenere_decrypt(cipher: str, key: str) -> str:
+    """Vigenere cipher decryption"""
+    key = key.upper()
+    key_len = len(key)
+    result = ""
+
+    for i, char in enumerate(cipher):
+        if char.isupper():
+            shift = ord(key[i % key_len]) - 65
+            result += chr((ord(char) - shift - 65) % 26 + 65)
+        elif char.islower():
+            shift = ord(key[i % key_len].lower()) - 97
+            result += chr((ord(char) - shift - 97) % 26 + 97)
+        else:
+            result += char
+
+    return result
+
+def des_encrypt(text: str, key: str) -> str:
+    """Simplified DES encryption (educational version)"""
+    # Convert key to binary
+    key_bin = ''.join(format(ord(c), '08b') for c in key[:8])
+    if len(key_bin) > 64:
+        key_bin = key_bin[:64]
+
+    # Simple XOR encryption
+    result = ""
+    for i, char in enumerate(text):
+        key_char = key_bin[i % len(key_bin)]
+        shift = int(key_char)
+        result += caesar_encrypt(char, shift)
+
+    return result
+
+def des_decrypt(cipher: str, key: str) -> str:
+    """Simplified DES decryption"""
+    key_bin = ''.join(format(ord(c), '08b') for c in key[:8])
+    if len(key_bin) > 64:
+        key_bin = key_bin[:64]
+
+    result = ""
+    for i, char in enumerate(cipher):
+        key_char = key_bin[i % len(key_bin)]
+        shift = int(key_char)
+        result += caesar_decrypt(char, shift)
+
+    return result
+
+def random_text(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+def cases(seed: int, count: int = 50):
+    """(text, key) pairs of random lengths, keys of 1 to 16 characters"""
+    rng = random.Random(seed)
+    return [(random_text(rng, rng.randint(0, 300)), random_text(rng, rng.randint(1, 16)))
+            for _ in range(count)]
+
+@pytest.mark.parametrize("text,key", cases(1))
+def test_vigenere_matches_reference(text, key):
+    assert vigenere_encrypt_np(text, key) == vigenere_encrypt(text, key)
+    assert vigenere_decrypt_np(text, key) == vigenere_decrypt(text, key)
+    assert text_encryption.vigenere_encrypt(text, key) == vigenere_encrypt(text, key)
+    assert text_encryption.vigenere_decrypt(text, key) == vigenere_decrypt(text, key)
+
+@pytest.mark.parametrize("text,key", cases(2))
+def test_des_matches_reference(text, key):
+    assert des_encrypt_np(text, key) == des_encrypt(text, key)
+    assert des_decrypt_np(text, key) == des_decrypt(text, key)
+    assert text_encryption.des_encrypt(text, key) == des_encrypt(text, key)
+    assert text_encryption.des_decrypt(text, key) == des_decrypt(text, key)
+
+@pytest.mark.parametrize("text,key", cases(3, 10))
+def test_round_trip_matches_reference(text, key):
+    cipher = vigenere_encrypt(text, key)
+    assert vigenere_decrypt_np(cipher, key) == vigenere_decrypt(cipher, key)
+    cipher = des_encrypt(text, key)
+    assert des_decrypt_np(cipher, key) == des_decrypt(cipher, key)
@@ -1,11 +1,64 @@
 """
 Text encryption algorithms package
+
+Cipher modules are imported on first attribute access, so that e.g.
+`from text_encryption import caesar_encrypt` does not pay for NumPy or
+pycryptodome.
 """
-from .transposition import *
-from .caesar import *
-from .affine import *
-from .hill import *
-from .vigenere import *
-from .des import *
-from .aes import *
-from .rsa import *
\ No newline at end of file
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'transposition': [
+        'Transposition', 'column_layout',
+        'transposition_encrypt', 'transposition_decrypt',
+        'transposition_encrypt_stream', 'transposition_decrypt_stream',
+    ],
+    'caesar': ['Caesar', 'caesar_encrypt', 'caesar_decrypt', 'affine_map'],
+    'affine': ['Affine', 'affine_encrypt', 'affine_decrypt', 'mod_inverse'],
+    'hill': [
+        'Hill', 'clean_letters', 'hill_encrypt', 'hill_decrypt',
+        'is_valid_hill_key', 'matrix_mod_inverse', 'mod_inverse_hill',
+    ],
+    'vigenere': ['Vigenere', 'vigenere_encrypt', 'vigenere_decrypt', 'vigenere_shifts', 'PeriodicShift'],
+    'des': ['SimplifiedDES', 'des_encrypt', 'des_decrypt', 'des_key_bits'],
+    'aes': [
+        'CHUNK_SIZE', 'CTR_NONCE_SIZE', 'GCM_NONCE_SIZE', 'GCM_TAG_SIZE', 'SALT_SIZE',
+        'SimplifiedAES', 'aes_encrypt', 'aes_decrypt', 'aes_encrypt_bytes', 'aes_decrypt_bytes',
+        'decode_plain_text', 'derive_aes_key', 'AESCTR', 'AESGCM',
+        'aes_ctr_encrypt', 'aes_ctr_decrypt', 'aes_ctr_encrypt_bytes', 'aes_ctr_decrypt_bytes', 'aes_ctr_encrypt_stream', 'aes_ctr_decrypt_stream',
+        'aes_gcm_encrypt', 'aes_gcm_decrypt', 'aes_gcm_encrypt_bytes', 'aes_gcm_decrypt_bytes',
+        'aes_gcm_encrypt_stream', 'aes_gcm_decrypt_stream',
+    ],
+    'rsa': [
+        'DEFAULT_KEY_BITS', 'MIN_KEY_BITS', 'MAX_KEY_BITS', 'PADDING_OVERHEAD', 'PUBLIC_EXPONENT',
+        'RSAPrivateKey', 'rsa_generate_keys', 'rsa_generate_keys_async',
+        'rsa_encrypt', 'rsa_decrypt', 'rsa_encrypt_bytes', 'rsa_decrypt_bytes',
+    ],
+    'vectorized': [
+        'text_to_codes', 'codes_to_text', 'case_masks', 'shift_codes', 'shift_letters',
+        'vigenere_encrypt_np', 'vigenere_decrypt_np', 'des_encrypt_np', 'des_decrypt_np',
+    ],
+    'registry': ['CIPHERS', 'get_cipher'],
+    'batch': ['MAX_BATCH_CELLS', 'encrypt_many', 'decrypt_many', 'pack_texts', 'unpack_texts'],
+    'parallel': ['MIN_CHUNK_SIZE', 'PARALLEL_CIPHERS', 'parallel_encrypt', 'parallel_decrypt'],
+}
+
+_LOCATIONS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LOCATIONS)
+
+def __getattr__(name: str):
+    """Import the defining submodule on first access and cache the name"""
+    module = _LOCATIONS.get(name)
+    if module is None:
+        if name in _EXPORTS:
+            return importlib.import_module(f'.{name}', __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_EXPORTS))
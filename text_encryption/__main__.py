@@ -0,0 +1,141 @@
+"""
+Command-line File Encryption
+
+Encrypt or decrypt files and whole directory trees, for example:
+    python -m text_encryption encrypt vigenere notes.txt notes.enc --key LEMON
+    python -m text_encryption decrypt aes-gcm backup.enc backup --key secret --jobs 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from utils import mod_inverse
+from .aes import CHUNK_SIZE
+from .files import FILE_CIPHERS, open_cipher, transform_file
+from .hill import is_valid_hill_key
+
+MB = 1 << 20
+
+def parse_key(cipher: str, key: str):
+    """Turn the --key string into the key type the cipher expects
+
+    Caesar takes an int, Affine "a,b" and Hill rows separated by ';'
+    such as "3,3;2,5". Every other cipher takes the string as is.
+    Raises ValueError for keys the cipher cannot use.
+    """
+    try:
+        if cipher == "caesar":
+            return int(key)
+        if cipher == "affine":
+            a, b = (int(x) for x in key.split(","))
+        elif cipher == "hill":
+            matrix = [[int(x) for x in row.split(",")] for row in key.split(";")]
+        else:
+            return key
+    except ValueError:
+        raise ValueError(f"invalid {cipher} key {key!r}") from None
+
+    if cipher == "affine":
+        if mod_inverse(a, 26) is None:
+            raise ValueError(f"affine key 'a' ({a}) must be coprime with 26")
+        return (a, b)
+    if any(len(row) != len(matrix) for row in matrix):
+        raise ValueError(f"hill key {key!r} is not a square matrix")
+    if not is_valid_hill_key(matrix):
+        raise ValueError(f"hill key {key!r} is not invertible modulo 26")
+    return matrix
+
+def plan_jobs(src: str, dst: str) -> list:
+    """(input, output) file pairs, mirroring a directory tree under dst"""
+    if not os.path.isdir(src):
+        return [(src, dst)]
+
+    jobs = []
+    for root, _, files in os.walk(src):
+        out_dir = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(out_dir, exist_ok=True)
+        for name in sorted(files):
+            jobs.append((os.path.join(root, name), os.path.join(out_dir, name)))
+    return jobs
+
+def _run_job(src: str, dst: str, cipher: str, key, decrypt: bool, chunk_size: int) -> tuple:
+    """Process one file, returning (src, bytes read, seconds)"""
+    start = time.perf_counter()
+    size = transform_file(src, dst, cipher, key, decrypt, chunk_size)
+    return src, size, time.perf_counter() - start
+
+class _Inline:
+    """Executor stand-in running each job immediately in this process"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m text_encryption",
+                                     description="Encrypt or decrypt files and directories",
+                                     epilog="Files are streamed, so transposition transposes "
+                                            "each block of 1M characters on its own: longer "
+                                            "files differ from the in-memory cipher and must "
+                                            "be decrypted with this tool.")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("cipher", choices=FILE_CIPHERS)
+    parser.add_argument("input", help="file or directory to read")
+    parser.add_argument("output", help="file or directory to write")
+    parser.add_argument("--key", required=True,
+                        help="cipher key: an int for caesar, 'a,b' for affine, "
+                             "'3,3;2,5' for hill, a string otherwise")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of files processed concurrently")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="read buffer size in bytes")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary line")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} does not exist")
+    decrypt = args.mode == "decrypt"
+    try:
+        key = parse_key(args.cipher, args.key)
+        open_cipher(args.cipher, key, decrypt)
+    except ValueError as e:
+        parser.error(str(e))
+    jobs = plan_jobs(args.input, args.output)
+
+    start = time.perf_counter()
+    total = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else _Inline() as pool:
+        futures = [pool.submit(_run_job, src, dst, args.cipher, key, decrypt, args.chunk_size)
+                   for src, dst in jobs]
+        for future in futures:
+            try:
+                src, size, elapsed = future.result()
+            except (OSError, ValueError) as e:
+                failed += 1
+                print(f"Error: {e}", file=sys.stderr)
+                continue
+            total += size
+            if not args.quiet:
+                print(f"{src}: {size / MB:.2f} MB in {elapsed:.3f}s "
+                      f"({size / MB / max(elapsed, 1e-9):.1f} MB/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs) - failed} file(s), {total / MB:.2f} MB in {elapsed:.3f}s "
+          f"({total / MB / max(elapsed, 1e-9):.1f} MB/s)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
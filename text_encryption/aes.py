@@ -1,34 +1,294 @@
 """
-Simplified AES Implementation (Educational)
+Simplified AES Implementation (Educational) and AES-CTR/GCM Backend
 """
 import hashlib
+import numpy as np
+from Crypto.Cipher import AES
+from Crypto.Protocol.KDF import scrypt
+from Crypto.Random import get_random_bytes
+
+CHUNK_SIZE = 1 << 20
+CTR_NONCE_SIZE = 8
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+
+# Passphrases go through scrypt with a random salt stored in the header
+SALT_SIZE = 16
+SCRYPT_N = 1 << 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+def _xor_with_pattern(data: bytes, pattern: np.ndarray, offset: int = 0) -> bytes:
+    """XOR data with pattern repeated, starting at keystream byte offset"""
+    period = pattern.size
+    pattern = np.roll(pattern, -(offset % period))
+    buf = np.frombuffer(data, dtype=np.uint8)
+    out = np.empty_like(buf)
+
+    # Broadcast the key hash over whole periods instead of tiling it
+    whole = buf.size - buf.size % period
+    np.bitwise_xor(buf[:whole].reshape(-1, period), pattern,
+                   out=out[:whole].reshape(-1, period))
+    np.bitwise_xor(buf[whole:], pattern[:buf.size - whole], out=out[whole:])
+
+    return out.tobytes()
+
+def decode_plain_text(plain: bytes) -> str:
+    """Decode decrypted bytes as UTF-8, falling back to Latin-1"""
+    try:
+        return plain.decode('utf-8')
+    except UnicodeDecodeError:
+        # Cipher text produced by the former one-byte-per-character format
+        return plain.decode('latin-1')
+
+class SimplifiedAES:
+    """Simplified AES with the SHA-256 key schedule computed once"""
+    __slots__ = ('key_hash', '_pattern')
+
+    def __init__(self, key: str):
+        # Generate key schedule
+        self.key_hash = hashlib.sha256(key.encode()).digest()
+        self._pattern = np.frombuffer(self.key_hash, dtype=np.uint8)
+
+    def encrypt_bytes(self, data: bytes, offset: int = 0) -> bytes:
+        """Encrypt raw bytes starting at keystream byte offset"""
+        return _xor_with_pattern(data, self._pattern, offset)
+
+    def decrypt_bytes(self, data: bytes, offset: int = 0) -> bytes:
+        """Decrypt raw bytes - XOR is symmetric"""
+        return _xor_with_pattern(data, self._pattern, offset)
+
+    def encrypt(self, text: str) -> str:
+        """Encrypt text to a hex string"""
+        return self.encrypt_bytes(text.encode('utf-8')).hex()
+
+    def decrypt(self, cipher_hex: str) -> str:
+        """Decrypt a hex string back to text"""
+        return decode_plain_text(self.decrypt_bytes(bytes.fromhex(cipher_hex)))
+
+def aes_encrypt_bytes(data: bytes, key: str, offset: int = 0) -> bytes:
+    """Simplified AES encryption of raw bytes"""
+    return SimplifiedAES(key).encrypt_bytes(data, offset)
+
+def aes_decrypt_bytes(data: bytes, key: str, offset: int = 0) -> bytes:
+    """Simplified AES decryption of raw bytes - XOR is symmetric"""
+    return SimplifiedAES(key).decrypt_bytes(data, offset)
 
 def aes_encrypt(text: str, key: str) -> str:
     """Simplified AES encryption (educational version)"""
-    # Generate key schedule
-    key_hash = hashlib.sha256(key.encode()).digest()
-    
-    # Simple XOR with key hash
-    result_bytes = []
-    for i, char in enumerate(text):
-        key_byte = key_hash[i % len(key_hash)]
-        result_bytes.append(ord(char) ^ key_byte)
-    
-    # Convert to hex string
-    return ''.join(format(b, '02x') for b in result_bytes)
+    return SimplifiedAES(key).encrypt(text)
 
 def aes_decrypt(cipher_hex: str, key: str) -> str:
     """Simplified AES decryption"""
-    # Convert hex to bytes
-    cipher_bytes = bytes.fromhex(cipher_hex)
-    
-    # Generate key hash
-    key_hash = hashlib.sha256(key.encode()).digest()
-    
-    # Decrypt
-    result = ""
-    for i, byte in enumerate(cipher_bytes):
-        key_byte = key_hash[i % len(key_hash)]
-        result += chr(byte ^ key_byte)
-    
-    return result
\ No newline at end of file
+    return SimplifiedAES(key).decrypt(cipher_hex)
+
+
+# ============================================
+# AES-CTR / AES-GCM (pycryptodome, AES-NI)
+# ============================================
+
+def derive_aes_key(key, salt: bytes = b'') -> bytes:
+    """AES-256 key from a passphrase and salt; raw 16/24/32-byte keys pass through"""
+    if isinstance(key, (bytes, bytearray)):
+        if len(key) not in (16, 24, 32):
+            raise ValueError("AES key must be 16, 24 or 32 bytes long")
+        return bytes(key)
+    if len(salt) != SALT_SIZE:
+        raise ValueError(f"Passphrase keys need a {SALT_SIZE}-byte salt")
+    return scrypt(key.encode(), salt, 32, N=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+
+def _salt_size(key) -> int:
+    """Salt bytes in the header: passphrases carry one, raw keys none"""
+    return 0 if isinstance(key, (bytes, bytearray)) else SALT_SIZE
+
+def _pump(src, dst, update, chunk_size: int) -> int:
+    """Copy src to dst through update() one chunk at a time"""
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        dst.write(update(chunk))
+        total += len(chunk)
+
+class AESCTR:
+    """AES-CTR under one passphrase or raw key: salt || nonce || cipher text
+
+    A passphrase is stretched at most once per salt: every message this
+    object encrypts shares one random salt (each gets its own nonce), and
+    the keys of salts met while decrypting are kept for the next message.
+    """
+    __slots__ = ('key', 'salt', '_keys')
+    MODE = AES.MODE_CTR
+    NONCE_SIZE = CTR_NONCE_SIZE
+    # Derived keys kept per object, oldest dropped first
+    MAX_KEYS = 32
+
+    def __init__(self, key):
+        if isinstance(key, (bytes, bytearray)):
+            key = derive_aes_key(key)  # Checks the length
+        self.key = key
+        self.salt = get_random_bytes(_salt_size(key))
+        self._keys = {}
+
+    def _aes_key(self, salt: bytes) -> bytes:
+        aes_key = self._keys.get(salt)
+        if aes_key is None:
+            if len(self._keys) >= self.MAX_KEYS:
+                del self._keys[next(iter(self._keys))]
+            aes_key = self._keys[salt] = derive_aes_key(self.key, salt)
+        return aes_key
+
+    @property
+    def header_size(self) -> int:
+        """Bytes of salt || nonce in front of the cipher text"""
+        return len(self.salt) + self.NONCE_SIZE
+
+    def _new_cipher(self) -> tuple:
+        """(salt || nonce header, cipher) with a fresh random nonce"""
+        nonce = get_random_bytes(self.NONCE_SIZE)
+        return self.salt + nonce, AES.new(self._aes_key(self.salt), self.MODE, nonce=nonce)
+
+    def _header_cipher(self, header: bytes):
+        """Cipher for the salt || nonce header read back from cipher text"""
+        salt_size = len(self.salt)
+        return AES.new(self._aes_key(header[:salt_size]), self.MODE, nonce=header[salt_size:])
+
+    def _read_header(self, src) -> bytes:
+        """Read the salt || nonce header at the start of a stream"""
+        header = src.read(self.header_size)
+        if len(header) < self.header_size:
+            raise ValueError("Cipher text is too short")
+        return header
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt raw bytes under a fresh nonce"""
+        header, cipher = self._new_cipher()
+        return header + cipher.encrypt(data)
+
+    def decrypt_bytes(self, data: bytes) -> bytes:
+        """Decrypt salt || nonce || cipher text"""
+        size = self.header_size
+        if len(data) < size:
+            raise ValueError("Cipher text is too short")
+        return self._header_cipher(data[:size]).decrypt(data[size:])
+
+    def encrypt(self, text: str) -> str:
+        """Encrypt text to a hex string"""
+        return self.encrypt_bytes(text.encode('utf-8')).hex()
+
+    def decrypt(self, cipher_hex: str) -> str:
+        """Decrypt a hex string back to text"""
+        return self.decrypt_bytes(bytes.fromhex(cipher_hex)).decode('utf-8')
+
+    def encrypt_stream(self, src, dst, chunk_size: int = CHUNK_SIZE) -> int:
+        """Encrypt binary file object src into dst in constant memory"""
+        header, cipher = self._new_cipher()
+        dst.write(header)
+        return _pump(src, dst, cipher.encrypt, chunk_size)
+
+    def decrypt_stream(self, src, dst, chunk_size: int = CHUNK_SIZE) -> int:
+        """Decrypt binary file object src into dst in constant memory"""
+        return _pump(src, dst, self._header_cipher(self._read_header(src)).decrypt, chunk_size)
+
+class AESGCM(AESCTR):
+    """AES-GCM under one passphrase or raw key: salt || nonce || cipher text || tag"""
+    __slots__ = ()
+    MODE = AES.MODE_GCM
+    NONCE_SIZE = GCM_NONCE_SIZE
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt and authenticate raw bytes under a fresh nonce"""
+        header, cipher = self._new_cipher()
+        body, tag = cipher.encrypt_and_digest(data)
+        return header + body + tag
+
+    def decrypt_bytes(self, data: bytes) -> bytes:
+        """Decrypt and verify, raises ValueError if authentication fails"""
+        size = self.header_size
+        if len(data) < size + GCM_TAG_SIZE:
+            raise ValueError("Cipher text is too short")
+        body, tag = data[size:-GCM_TAG_SIZE], data[-GCM_TAG_SIZE:]
+        return self._header_cipher(data[:size]).decrypt_and_verify(body, tag)
+
+    def encrypt_stream(self, src, dst, chunk_size: int = CHUNK_SIZE) -> int:
+        """Encrypt binary file object src into dst, tag written last"""
+        header, cipher = self._new_cipher()
+        dst.write(header)
+        total = _pump(src, dst, cipher.encrypt, chunk_size)
+        dst.write(cipher.digest())
+        return total
+
+    def decrypt_stream(self, src, dst, chunk_size: int = CHUNK_SIZE) -> int:
+        """Decrypt binary file object src into dst
+
+        The tag sits at the end of the stream, so plain text is written
+        before it can be verified. A ValueError is raised once the tag
+        check fails and the output must then be discarded.
+        """
+        cipher = self._header_cipher(self._read_header(src))
+
+        # Always hold back the last GCM_TAG_SIZE bytes read: they may be the tag
+        pending = b''
+        total = 0
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            body, pending = pending[:-GCM_TAG_SIZE], pending[-GCM_TAG_SIZE:]
+            dst.write(cipher.decrypt(body))
+            total += len(body)
+
+        if len(pending) != GCM_TAG_SIZE:
+            raise ValueError("Cipher text is too short")
+        cipher.verify(pending)
+        return total
+
+def aes_ctr_encrypt_bytes(data: bytes, key) -> bytes:
+    """AES-CTR encryption: salt || nonce || cipher text"""
+    return AESCTR(key).encrypt_bytes(data)
+
+def aes_ctr_decrypt_bytes(data: bytes, key) -> bytes:
+    """AES-CTR decryption of salt || nonce || cipher text"""
+    return AESCTR(key).decrypt_bytes(data)
+
+def aes_ctr_encrypt(text: str, key: str) -> str:
+    """AES-CTR encryption of text, hex encoded"""
+    return AESCTR(key).encrypt(text)
+
+def aes_ctr_decrypt(cipher_hex: str, key: str) -> str:
+    """AES-CTR decryption of hex cipher text"""
+    return AESCTR(key).decrypt(cipher_hex)
+
+def aes_gcm_encrypt_bytes(data: bytes, key) -> bytes:
+    """AES-GCM encryption: salt || nonce || cipher text || tag"""
+    return AESGCM(key).encrypt_bytes(data)
+
+def aes_gcm_decrypt_bytes(data: bytes, key) -> bytes:
+    """AES-GCM decryption, raises ValueError if authentication fails"""
+    return AESGCM(key).decrypt_bytes(data)
+
+def aes_gcm_encrypt(text: str, key: str) -> str:
+    """AES-GCM encryption of text, hex encoded"""
+    return AESGCM(key).encrypt(text)
+
+def aes_gcm_decrypt(cipher_hex: str, key: str) -> str:
+    """AES-GCM decryption of hex cipher text"""
+    return AESGCM(key).decrypt(cipher_hex)
+
+def aes_ctr_encrypt_stream(src, dst, key, chunk_size: int = CHUNK_SIZE) -> int:
+    """AES-CTR encrypt binary file object src into dst in constant memory"""
+    return AESCTR(key).encrypt_stream(src, dst, chunk_size)
+
+def aes_ctr_decrypt_stream(src, dst, key, chunk_size: int = CHUNK_SIZE) -> int:
+    """AES-CTR decrypt binary file object src into dst in constant memory"""
+    return AESCTR(key).decrypt_stream(src, dst, chunk_size)
+
+def aes_gcm_encrypt_stream(src, dst, key, chunk_size: int = CHUNK_SIZE) -> int:
+    """AES-GCM encrypt binary file object src into dst, tag written last"""
+    return AESGCM(key).encrypt_stream(src, dst, chunk_size)
+
+def aes_gcm_decrypt_stream(src, dst, key, chunk_size: int = CHUNK_SIZE) -> int:
+    """AES-GCM decrypt binary file object src into dst, see AESGCM.decrypt_stream"""
+    return AESGCM(key).decrypt_stream(src, dst, chunk_size)
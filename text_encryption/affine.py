@@ -2,35 +2,38 @@
 Affine Cipher Implementation
 """
 from utils import mod_inverse
+from .substitution import affine_map
+
+class Affine:
+    """Affine cipher with precompiled translation tables"""
+    __slots__ = ('a', 'b', 'a_inv', '_encrypt', '_decrypt')
+
+    def __init__(self, a: int, b: int):
+        self.a = a
+        self.b = b
+        self._encrypt = affine_map(a, b)
+
+        # D(x) = a^-1 * x - a^-1 * b, which is itself an affine map
+        self.a_inv = mod_inverse(a, 26)
+        if self.a_inv is None:
+            self._decrypt = None
+        else:
+            self._decrypt = affine_map(self.a_inv, -self.a_inv * b)
+
+    def encrypt(self, text: str) -> str:
+        """Affine cipher encryption: E(x) = (ax + b) mod 26"""
+        return self._encrypt(text)
+
+    def decrypt(self, cipher: str) -> str:
+        """Affine cipher decryption: D(x) = a^-1(x - b) mod 26"""
+        if self._decrypt is None:
+            return "Error: 'a' must be coprime with 26"
+        return self._decrypt(cipher)
 
 def affine_encrypt(text: str, a: int, b: int) -> str:
     """Affine cipher encryption: E(x) = (ax + b) mod 26"""
-    result = ""
-    for char in text:
-        if char.isupper():
-            x = ord(char) - 65
-            result += chr((a * x + b) % 26 + 65)
-        elif char.islower():
-            x = ord(char) - 97
-            result += chr((a * x + b) % 26 + 97)
-        else:
-            result += char
-    return result
+    return Affine(a, b).encrypt(text)
 
 def affine_decrypt(cipher: str, a: int, b: int) -> str:
     """Affine cipher decryption: D(x) = a^-1(x - b) mod 26"""
-    a_inv = mod_inverse(a, 26)
-    if a_inv is None:
-        return "Error: 'a' must be coprime with 26"
-    
-    result = ""
-    for char in cipher:
-        if char.isupper():
-            x = ord(char) - 65
-            result += chr((a_inv * (x - b)) % 26 + 65)
-        elif char.islower():
-            x = ord(char) - 97
-            result += chr((a_inv * (x - b)) % 26 + 97)
-        else:
-            result += char
-    return result
\ No newline at end of file
+    return Affine(a, b).decrypt(cipher)
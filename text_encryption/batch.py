@@ -0,0 +1,211 @@
+"""
+Batch Encryption: one vectorized pass over many messages
+"""
+from itertools import accumulate
+from typing import List
+import numpy as np
+from .affine import Affine
+from .aes import AESCTR, AESGCM, SimplifiedAES, decode_plain_text
+from .caesar import Caesar
+from .des import SimplifiedDES
+from .hill import Hill, clean_letters
+from .registry import get_cipher
+from .transposition import Transposition
+from .vectorized import text_to_codes, codes_to_text, shift_codes
+from .vigenere import Vigenere
+
+# Most records x padded width cells of one kernel call
+MAX_BATCH_CELLS = 1 << 22
+
+def _split(joined, lengths: List[int]) -> list:
+    """Cut a joined str/bytes back into pieces of the given lengths"""
+    ends = list(accumulate(lengths))
+    return [joined[end - length:end] for end, length in zip(ends, lengths)]
+
+def _pad(flat: np.ndarray, lengths: np.ndarray, fill=0) -> tuple:
+    """Scatter the concatenated records into a padded (records x width) array"""
+    width = int(lengths.max()) if lengths.size else 0
+    matrix = np.full((lengths.size, width), fill, dtype=flat.dtype)
+    mask = np.arange(width) < lengths[:, None]
+    matrix[mask] = flat
+    return matrix, mask
+
+def pack_texts(texts: List[str]) -> tuple:
+    """Pack texts into a padded 2-D code array, a validity mask and lengths"""
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    matrix, mask = _pad(text_to_codes(''.join(texts)), lengths)
+    return matrix, mask, lengths
+
+def unpack_texts(matrix: np.ndarray, mask: np.ndarray, lengths: np.ndarray) -> List[str]:
+    """Inverse of pack_texts"""
+    return _split(codes_to_text(matrix[mask]), lengths.tolist())
+
+def _shift_params(cipher, decrypt: bool) -> tuple:
+    """(a, upper_shifts, lower_shifts) of a substitution cipher"""
+    if isinstance(cipher, Caesar):
+        shift = -cipher.shift if decrypt else cipher.shift
+        return 1, [shift], [shift]
+    if isinstance(cipher, Affine):
+        if not decrypt:
+            return cipher.a, [cipher.b], [cipher.b]
+        return cipher.a_inv, [-cipher.a_inv * cipher.b], [-cipher.a_inv * cipher.b]
+    upper, lower = cipher.upper_shifts, cipher.lower_shifts
+    if decrypt:
+        return 1, [-s for s in upper], [-s for s in lower]
+    return 1, upper, lower
+
+def _substitution_many(cipher, texts: List[str], decrypt: bool) -> List[str]:
+    """Caesar, Affine, Vigenere and DES: every record is a row of one array"""
+    if decrypt and isinstance(cipher, Affine) and cipher.a_inv is None:
+        return [cipher.decrypt(t) for t in texts]
+
+    matrix, mask, lengths = pack_texts(texts)
+    if matrix.size == 0:
+        return list(texts)
+
+    a, upper, lower = _shift_params(cipher, decrypt)
+    return unpack_texts(shift_codes(matrix, upper, lower, a=a), mask, lengths)
+
+def _hill_many(cipher: Hill, texts: List[str], decrypt: bool) -> List[str]:
+    """Hill: all blocks of all records in one batched matmul"""
+    key = cipher.inverse if decrypt else cipher.key
+    if key is None:
+        return [cipher.decrypt(t) for t in texts]
+
+    n = cipher.n
+    letters = [clean_letters(t) for t in texts]
+    lengths = np.array([len(t) for t in letters], dtype=np.int64)
+    padded = -(-lengths // n) * n
+
+    codes = (text_to_codes(''.join(letters)).astype(np.int64) - 65) % 26
+    # Every position past the letters is the 'X' padding
+    matrix, _ = _pad(codes, lengths, fill=ord('X') - 65)
+    if matrix.size == 0:
+        return ["" for _ in texts]
+    matrix = np.pad(matrix, ((0, 0), (0, -matrix.shape[1] % n)), constant_values=ord('X') - 65)
+
+    # Entries are < 26, so float64 stays exact; (records, blocks, n) @ K^T
+    blocks = matrix.reshape(matrix.shape[0], -1, n).astype(np.float64)
+    result = (blocks @ np.array(key, dtype=np.float64).T) % 26 + 65
+    result = result.reshape(matrix.shape).astype(np.uint8)
+
+    mask = np.arange(matrix.shape[1]) < padded[:, None]
+    out = _split(result[mask].tobytes().decode('ascii'), padded.tolist())
+
+    if decrypt:
+        for i, length in enumerate(lengths.tolist()):
+            if length % n:
+                out[i] = f"Error: Cipher text length ({length}) is not a multiple of {n}"
+    return out
+
+def _transposition_many(cipher: Transposition, texts: List[str], decrypt: bool) -> List[str]:
+    """Transposition: one row-wise gather (or scatter) for every record"""
+    if not decrypt:
+        texts = [t.replace(" ", "").upper() for t in texts]
+    matrix, mask, lengths = pack_texts(texts)
+    if matrix.size == 0:
+        return list(texts)
+
+    # Position i of a record sits in column i % k, row i // k; cipher text
+    # reads whole columns in key order, so sorting valid positions by
+    # (column rank, row) gives every record's permutation at once
+    k = cipher.key_len
+    width = matrix.shape[1]
+    rank = np.empty(k, dtype=np.int64)
+    rank[sorted(range(k), key=lambda i: cipher.key[i])] = np.arange(k)
+    positions = np.arange(width)
+    order = np.where(mask, rank[positions % k] * width + positions // k, np.iinfo(np.int64).max)
+    perm = np.argsort(order, axis=1, kind='stable')
+
+    if decrypt:
+        result = np.empty_like(matrix)
+        np.put_along_axis(result, perm, matrix, axis=1)
+    else:
+        result = np.take_along_axis(matrix, perm, axis=1)
+    return unpack_texts(result, mask, lengths)
+
+def _aes_many(cipher: SimplifiedAES, texts: List[str], decrypt: bool) -> List[str]:
+    """Simplified AES: XOR all records against one broadcast keystream row"""
+    if decrypt:
+        data = [bytes.fromhex(t) for t in texts]
+    else:
+        data = [t.encode('utf-8') for t in texts]
+    lengths = np.array([len(d) for d in data], dtype=np.int64)
+    matrix, mask = _pad(np.frombuffer(b''.join(data), dtype=np.uint8), lengths)
+
+    pattern = np.frombuffer(cipher.key_hash, dtype=np.uint8)
+    width = matrix.shape[1]
+    matrix ^= np.tile(pattern, -(-width // pattern.size))[:width]
+
+    flat = matrix[mask].tobytes()
+    if decrypt:
+        return [decode_plain_text(d) for d in _split(flat, lengths.tolist())]
+    return _split(flat.hex(), (2 * lengths).tolist())
+
+def _aes_mode_many(cipher: AESCTR, texts: List[str], decrypt: bool) -> List[str]:
+    """AES-CTR/GCM: one nonce (and tag) per record, one key derivation per batch"""
+    apply = cipher.decrypt if decrypt else cipher.encrypt
+    return [apply(t) for t in texts]
+
+_BATCH_KERNELS = {
+    Caesar: _substitution_many,
+    Affine: _substitution_many,
+    Vigenere: _substitution_many,
+    SimplifiedDES: _substitution_many,
+    Hill: _hill_many,
+    Transposition: _transposition_many,
+    SimplifiedAES: _aes_many,
+    AESCTR: _aes_mode_many,
+    AESGCM: _aes_mode_many,
+}
+
+def _buckets(lengths: List[int], max_cells: int) -> List[List[int]]:
+    """Record indices grouped by length so each group pads to at most max_cells
+
+    A record longer than max_cells gets a group of its own.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets, current = [], []
+    for i in order:
+        # Sorted by length, so the newest record sets the padded width
+        if current and (len(current) + 1) * lengths[i] > max_cells:
+            buckets.append(current)
+            current = []
+        current.append(i)
+    buckets.append(current)
+    return buckets
+
+def _run_many(texts: List[str], cipher, key, decrypt: bool) -> List[str]:
+    """Resolve the cipher once and run its batch kernel on each length bucket"""
+    if isinstance(cipher, str):
+        cipher = get_cipher(cipher, key)
+    texts = list(texts)
+    if not texts:
+        return []
+    kernel = _BATCH_KERNELS[type(cipher)]
+
+    lengths = [len(t) for t in texts]
+    if len(texts) * max(lengths) <= MAX_BATCH_CELLS:
+        return kernel(cipher, texts, decrypt)
+
+    out = [None] * len(texts)
+    for bucket in _buckets(lengths, MAX_BATCH_CELLS):
+        for i, result in zip(bucket, kernel(cipher, [texts[i] for i in bucket], decrypt)):
+            out[i] = result
+    return out
+
+def encrypt_many(texts: List[str], cipher, key=None) -> List[str]:
+    """Encrypt many texts under one key, in order
+
+    cipher is a registry name (with its key) or a prebuilt cipher object.
+    The key schedule is set up once and every record is a row of a
+    padded 2-D array. Records are padded to the longest one, so when
+    records x longest length exceeds MAX_BATCH_CELLS they are grouped
+    by length and each group runs separately, keeping the padded array
+    near MAX_BATCH_CELLS (or one record, if that is longer).
+    """
+    return _run_many(texts, cipher, key, decrypt=False)
+
+def decrypt_many(ciphers: List[str], cipher, key=None) -> List[str]:
+    """Decrypt many cipher texts under one key, in order"""
+    return _run_many(ciphers, cipher, key, decrypt=True)
@@ -1,18 +1,29 @@
 """
 Caesar Cipher Implementation
 """
+from .substitution import affine_map
+
+class Caesar:
+    """Caesar cipher with precompiled translation tables"""
+    __slots__ = ('shift', '_encrypt', '_decrypt')
+
+    def __init__(self, shift: int):
+        self.shift = shift
+        self._encrypt = affine_map(1, shift)
+        self._decrypt = affine_map(1, -shift)
+
+    def encrypt(self, text: str) -> str:
+        """Caesar cipher encryption"""
+        return self._encrypt(text)
+
+    def decrypt(self, cipher: str) -> str:
+        """Caesar cipher decryption"""
+        return self._decrypt(cipher)
+
 def caesar_encrypt(text: str, shift: int) -> str:
     """Caesar cipher encryption"""
-    result = ""
-    for char in text:
-        if char.isupper():
-            result += chr((ord(char) + shift - 65) % 26 + 65)
-        elif char.islower():
-            result += chr((ord(char) + shift - 97) % 26 + 97)
-        else:
-            result += char
-    return result
+    return Caesar(shift).encrypt(text)
 
 def caesar_decrypt(cipher: str, shift: int) -> str:
     """Caesar cipher decryption"""
-    return caesar_encrypt(cipher, -shift)
\ No newline at end of file
+    return Caesar(shift).decrypt(cipher)
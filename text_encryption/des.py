@@ -1,34 +1,28 @@
 """
 Simplified DES Implementation (Educational)
 """
-from .caesar import caesar_encrypt, caesar_decrypt
+from .substitution import PeriodicShift
 
-def des_encrypt(text: str, key: str) -> str:
-    """Simplified DES encryption (educational version)"""
+def des_key_bits(key: str) -> list:
+    """Expand the first 8 key characters into at most 64 shift bits"""
     # Convert key to binary
     key_bin = ''.join(format(ord(c), '08b') for c in key[:8])
     if len(key_bin) > 64:
         key_bin = key_bin[:64]
-    
-    # Simple XOR encryption
-    result = ""
-    for i, char in enumerate(text):
-        key_char = key_bin[i % len(key_bin)]
-        shift = int(key_char)
-        result += caesar_encrypt(char, shift)
-    
-    return result
+    return [int(bit) for bit in key_bin]
+
+class SimplifiedDES(PeriodicShift):
+    """Simplified DES: a Caesar shift of 0 or 1 per position, from the key bits"""
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        super().__init__(des_key_bits(key))
+        self.key = key
+
+def des_encrypt(text: str, key: str) -> str:
+    """Simplified DES encryption (educational version)"""
+    return SimplifiedDES(key).encrypt(text)
 
 def des_decrypt(cipher: str, key: str) -> str:
     """Simplified DES decryption"""
-    key_bin = ''.join(format(ord(c), '08b') for c in key[:8])
-    if len(key_bin) > 64:
-        key_bin = key_bin[:64]
-    
-    result = ""
-    for i, char in enumerate(cipher):
-        key_char = key_bin[i % len(key_bin)]
-        shift = int(key_char)
-        result += caesar_decrypt(char, shift)
-    
-    return result
\ No newline at end of file
+    return SimplifiedDES(key).decrypt(cipher)
@@ -1,142 +1,149 @@
 """
 Hill Cipher Implementation
 """
+from functools import lru_cache
 import numpy as np
 from utils import mod_inverse
 
+# Every byte that is not an ASCII letter, for bytes.translate(None, delete)
+_NON_LETTERS = bytes(b for b in range(256) if not chr(b).isalpha() or b > 127)
+
 def mod_inverse_hill(a: int, m: int = 26) -> int:
     """Find modular inverse of a mod m"""
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    return mod_inverse(a, m)
+
+def _key_tuple(key_matrix) -> tuple:
+    """Hashable copy of a key matrix with entries reduced mod 26"""
+    return tuple(tuple(int(x) % 26 for x in row) for row in key_matrix)
+
+@lru_cache(maxsize=256)
+def matrix_mod_inverse(key: tuple, m: int = 26) -> tuple:
+    """Return (det mod m, inverse mod m or None) by integer Gauss-Jordan"""
+    n = len(key)
+    # Augmented matrix [K | I]
+    rows = [[x % m for x in row] + [int(i == j) for j in range(n)]
+            for i, row in enumerate(key)]
+
+    # Forward elimination. m need not be prime, so the entries below each
+    # pivot are cleared with Euclid's algorithm on whole rows; every step
+    # is a row swap or a row subtraction, which keeps track of det exactly
+    det = 1
+    for col in range(n):
+        for r in range(col + 1, n):
+            while rows[r][col]:
+                q = rows[col][col] // rows[r][col]
+                rows[col] = [(x - q * y) % m for x, y in zip(rows[col], rows[r])]
+                rows[col], rows[r] = rows[r], rows[col]
+                det = -det
+        det = det * rows[col][col] % m
+
+    if mod_inverse(det, m) is None:
+        return det, None
+
+    # The determinant is a unit, so every pivot is too: normalise the
+    # pivots and clear the entries above them
+    for col in reversed(range(n)):
+        pivot_inv = mod_inverse(rows[col][col], m)
+        rows[col] = [x * pivot_inv % m for x in rows[col]]
+        for r in range(col):
+            factor = rows[r][col]
+            if factor:
+                rows[r] = [(x - factor * y) % m for x, y in zip(rows[r], rows[col])]
+
+    return det, tuple(tuple(row[n:]) for row in rows)
+
+def clean_letters(text: str) -> str:
+    """Uppercase text with everything but letters removed"""
+    text = text.upper()
+    if text.isascii():
+        return text.encode('ascii').translate(None, _NON_LETTERS).decode('ascii')
+    # str.isalpha() also accepts non-ASCII letters
+    return ''.join([c for c in text if c.isalpha()])
+
+def _clean_codes(text: str) -> np.ndarray:
+    """Uppercase letters of text as an int array of values x - 65"""
+    letters = clean_letters(text)
+    if letters.isascii():
+        codes = np.frombuffer(letters.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(letters.encode('utf-32-le'), dtype='<u4')
+    return codes.astype(np.int64) - 65
+
+def _apply_key(matrix: np.ndarray, codes: np.ndarray) -> str:
+    """Multiply every n-letter block by matrix mod 26 in one matmul"""
+    n = len(matrix)
+    # Entries are < 26, so float64 products and sums stay exact while the
+    # multiplication itself runs through BLAS
+    blocks = (codes % 26).reshape(-1, n).T.astype(np.float64)
+    result = (matrix @ blocks) % 26 + 65
+    return result.T.astype(np.uint8).tobytes().decode('ascii')
+
+def _float_matrix(matrix: tuple) -> np.ndarray:
+    """Read-only float64 copy of a key matrix"""
+    array = np.array(matrix, dtype=np.float64)
+    array.setflags(write=False)
+    return array
+
+class Hill:
+    """Hill cipher with the key matrix and its inverse precomputed"""
+    __slots__ = ('key', 'inverse', 'n', 'det', '_encrypt_matrix', '_decrypt_matrix')
+
+    def __init__(self, key_matrix: list):
+        self.key = _key_tuple(key_matrix)
+        self.n = len(self.key)
+        self.det, self.inverse = matrix_mod_inverse(self.key)
+        self._encrypt_matrix = _float_matrix(self.key)
+        self._decrypt_matrix = None if self.inverse is None else _float_matrix(self.inverse)
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the key matrix is invertible modulo 26"""
+        return self._decrypt_matrix is not None
+
+    def encrypt(self, text: str) -> str:
+        """Hill cipher encryption"""
+        codes = _clean_codes(text)
+
+        if len(codes) == 0:
+            return ""
+
+        n = self.n
+
+        # Pad with 'X' if needed
+        if len(codes) % n != 0:
+            codes = np.concatenate([codes, np.full(n - len(codes) % n, ord('X') - 65)])
+
+        return _apply_key(self._encrypt_matrix, codes)
+
+    def decrypt(self, cipher: str) -> str:
+        """Hill cipher decryption"""
+        codes = _clean_codes(cipher)
+
+        if len(codes) == 0:
+            return ""
+
+        if not self.is_valid:
+            return f"Error: Matrix determinant ({self.det}) not invertible modulo 26"
+
+        if len(codes) % self.n != 0:
+            return f"Error: Cipher text length ({len(codes)}) is not a multiple of {self.n}"
+
+        return _apply_key(self._decrypt_matrix, codes)
 
 def hill_encrypt(text: str, key_matrix: list) -> str:
     """Hill cipher encryption"""
-    text = text.upper().replace(" ", "")
-    # Remove non-alphabetic characters
-    text_clean = ''.join([c for c in text if c.isalpha()])
-    
-    if len(text_clean) == 0:
-        return ""
-    
-    n = len(key_matrix)
-    
-    # Pad with 'X' if needed
-    if len(text_clean) % n != 0:
-        text_clean += 'X' * (n - len(text_clean) % n)
-    
-    # Encrypt block by block
-    result = ""
-    for i in range(0, len(text_clean), n):
-        # Convert block to vector
-        vector = [ord(char) - 65 for char in text_clean[i:i+n]]
-        
-        # Multiply by key matrix
-        encrypted_vector = [0] * n
-        for row in range(n):
-            for col in range(n):
-                encrypted_vector[row] += key_matrix[row][col] * vector[col]
-            encrypted_vector[row] %= 26
-        
-        # Convert back to letters
-        for num in encrypted_vector:
-            result += chr(num + 65)
-    
-    return result
+    return Hill(key_matrix).encrypt(text)
 
 def hill_decrypt(cipher: str, key_matrix: list) -> str:
     """Hill cipher decryption"""
-    cipher = cipher.upper().replace(" ", "")
-    cipher_clean = ''.join([c for c in cipher if c.isalpha()])
-    
-    if len(cipher_clean) == 0:
-        return ""
-    
-    n = len(key_matrix)
-    
-    # Calculate determinant
-    if n == 2:
-        a, b = key_matrix[0][0], key_matrix[0][1]
-        c, d = key_matrix[1][0], key_matrix[1][1]
-        det = (a * d - b * c) % 26
-    elif n == 3:
-        a, b, c = key_matrix[0][0], key_matrix[0][1], key_matrix[0][2]
-        d, e, f = key_matrix[1][0], key_matrix[1][1], key_matrix[1][2]
-        g, h, i = key_matrix[2][0], key_matrix[2][1], key_matrix[2][2]
-        det = (a*(e*i - f*h) - b*(d*i - f*g) + c*(d*h - e*g)) % 26
-    else:
-        key_np = np.array(key_matrix, dtype=np.float64)
-        det = int(np.round(np.linalg.det(key_np))) % 26
-    
-    # Find modular inverse of determinant
-    det_inv = mod_inverse_hill(det, 26)
-    if det_inv is None:
-        return f"Error: Matrix determinant ({det}) not invertible modulo 26"
-    
-    # Calculate inverse matrix for 2x2
-    if n == 2:
-        a, b = key_matrix[0][0], key_matrix[0][1]
-        c, d = key_matrix[1][0], key_matrix[1][1]
-        
-        # Calculate adjugate matrix
-        adj = [[d % 26, (-b) % 26],
-               [(-c) % 26, a % 26]]
-        
-        # Multiply by modular inverse of determinant
-        inv_matrix = [[0, 0], [0, 0]]
-        for i in range(2):
-            for j in range(2):
-                inv_matrix[i][j] = (det_inv * adj[i][j]) % 26
-        
-        # Decrypt
-        result = ""
-        for i in range(0, len(cipher_clean), n):
-            vector = [ord(char) - 65 for char in cipher_clean[i:i+n]]
-            decrypted_vector = [0, 0]
-            
-            for row in range(n):
-                for col in range(n):
-                    decrypted_vector[row] += inv_matrix[row][col] * vector[col]
-                decrypted_vector[row] %= 26
-            
-            for num in decrypted_vector:
-                result += chr(num + 65)
-        
-        return result
-    
-    # For 3x3 or larger, use numpy
-    else:
-        key_np = np.array(key_matrix, dtype=np.float64)
-        adj = np.round(det * np.linalg.inv(key_np)).astype(int) % 26
-        inv_matrix = (det_inv * adj) % 26
-        
-        # Decrypt
-        result = ""
-        for i in range(0, len(cipher_clean), n):
-            vector = [ord(char) - 65 for char in cipher_clean[i:i+n]]
-            decrypted_vector = np.dot(inv_matrix, vector) % 26
-            
-            for num in decrypted_vector:
-                result += chr(num + 65)
-        
-        return result
+    return Hill(key_matrix).decrypt(cipher)
 
 def is_valid_hill_key(key_matrix: list) -> bool:
     """Check if Hill cipher key matrix is valid"""
     n = len(key_matrix)
     if any(len(row) != n for row in key_matrix):
         return False
-    
-    # Calculate determinant
-    if n == 2:
-        a, b = key_matrix[0][0], key_matrix[0][1]
-        c, d = key_matrix[1][0], key_matrix[1][1]
-        det = (a * d - b * c) % 26
-    else:
-        key_np = np.array(key_matrix, dtype=np.float64)
-        det = int(np.round(np.linalg.det(key_np))) % 26
-    
+
     # Check if determinant is invertible modulo 26
-    return mod_inverse_hill(det, 26) is not None
\ No newline at end of file
+    _, inv_matrix = matrix_mod_inverse(_key_tuple(key_matrix))
+    return inv_matrix is not None
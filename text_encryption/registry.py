@@ -0,0 +1,36 @@
+"""
+Registry of the symmetric text ciphers by name
+"""
+from .transposition import Transposition
+from .caesar import Caesar
+from .affine import Affine
+from .hill import Hill
+from .vigenere import Vigenere
+from .des import SimplifiedDES
+from .aes import AESCTR, AESGCM, SimplifiedAES
+
+# name -> factory building a cipher object from its key
+CIPHERS = {
+    "transposition": Transposition,
+    "caesar": Caesar,
+    "affine": lambda key: Affine(*key),
+    "hill": Hill,
+    "vigenere": Vigenere,
+    "des": SimplifiedDES,
+    "aes": SimplifiedAES,
+    "aes-ctr": AESCTR,
+    "aes-gcm": AESGCM,
+}
+
+def get_cipher(name: str, key):
+    """Build the cipher object registered under name
+
+    Keys are typed as for the functional API: an int shift for Caesar,
+    an (a, b) pair for Affine, a square matrix for Hill, a string or raw
+    16/24/32-byte key for AES-CTR/GCM and a string for every other cipher.
+    """
+    try:
+        factory = CIPHERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cipher '{name}', expected one of: {', '.join(CIPHERS)}") from None
+    return factory(key)
@@ -1,47 +1,160 @@
 """
-Simplified RSA Implementation (Educational)
+RSA Implementation (Educational)
 """
-import math
-from utils import mod_inverse
-
-def rsa_generate_keys():
-    """Generate RSA keys (simplified)"""
-    # Small primes for demonstration
-    p = 61
-    q = 53
+import base64
+import secrets
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+from utils import mod_inverse, random_prime
+
+DEFAULT_KEY_BITS = 2048
+MIN_KEY_BITS = 1024
+MAX_KEY_BITS = 4096
+PUBLIC_EXPONENT = 65537
+# PKCS#1 v1.5 padding overhead: 0x00 0x02 || at least 8 random bytes || 0x00
+PADDING_OVERHEAD = 11
+
+class RSAPrivateKey(NamedTuple):
+    """RSA private key with the CRT parameters dP, dQ and qInv"""
+    d: int
+    n: int
+    p: int
+    q: int
+    dp: int
+    dq: int
+    qinv: int
+
+def rsa_generate_keys(bits: int = DEFAULT_KEY_BITS):
+    """Generate an RSA key pair with a bits-bit modulus"""
+    if not MIN_KEY_BITS <= bits <= MAX_KEY_BITS:
+        raise ValueError(f"Key size must be between {MIN_KEY_BITS} and {MAX_KEY_BITS} bits")
+
+    e = PUBLIC_EXPONENT
+    while True:
+        p = random_prime(bits // 2, coprime_to=e)
+        q = random_prime(bits - bits // 2, coprime_to=e)
+        if p != q:
+            break
+    if p < q:
+        p, q = q, p
+
     n = p * q
     phi = (p - 1) * (q - 1)
-    
-    # Choose e
-    e = 17
-    while math.gcd(e, phi) != 1:
-        e += 1
-    
-    # Calculate d
     d = mod_inverse(e, phi)
-    
-    return (e, n), (d, n)
 
-def rsa_encrypt(text: str, public_key: tuple) -> str:
-    """RSA encryption"""
+    private_key = RSAPrivateKey(d, n, p, q, d % (p - 1), d % (q - 1), mod_inverse(q, p))
+    return (e, n), private_key
+
+_keygen_executor = None
+
+def rsa_generate_keys_async(bits: int = DEFAULT_KEY_BITS) -> Future:
+    """Generate an RSA key pair on a worker thread, returning a Future"""
+    global _keygen_executor
+    if _keygen_executor is None:
+        _keygen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rsa-keygen")
+    return _keygen_executor.submit(rsa_generate_keys, bits)
+
+def _rsa_decrypt_int(c: int, private_key: tuple) -> int:
+    """m = c^d mod n, through the Chinese Remainder Theorem when possible"""
+    if len(private_key) == 2:
+        d, n = private_key
+        return pow(c, d, n)
+
+    key = private_key
+    m1 = pow(c, key.dp, key.p)
+    m2 = pow(c, key.dq, key.q)
+    h = key.qinv * (m1 - m2) % key.p
+    return m2 + h * key.q
+
+def _modulus_bytes(n: int) -> int:
+    """Size of the modulus, and of every cipher text block, in bytes"""
+    return (n.bit_length() + 7) // 8
+
+def _pad_block(block: bytes, k: int) -> bytes:
+    """PKCS#1 v1.5 type 2 padding of block to k bytes"""
+    padding = bytearray(secrets.token_bytes(k - 3 - len(block)))
+    for i, byte in enumerate(padding):
+        while byte == 0:
+            byte = secrets.randbits(8)
+        padding[i] = byte
+    return b'\x00\x02' + bytes(padding) + b'\x00' + block
+
+def _unpad_block(padded: bytes) -> bytes:
+    """Strip PKCS#1 v1.5 type 2 padding"""
+    separator = padded.find(b'\x00', 2)
+    if padded[:2] != b'\x00\x02' or separator < PADDING_OVERHEAD - 1:
+        raise ValueError("Decryption error: invalid padding")
+    return padded[separator + 1:]
+
+def rsa_encrypt_bytes(data: bytes, public_key: tuple) -> bytes:
+    """RSA encryption of bytes packed into padded, modulus-sized blocks
+
+    Every block of cipher text is a fixed-width big-endian integer of
+    the modulus size, so the output needs no separators.
+    """
+    e, n = public_key
+    k = _modulus_bytes(n)
+    payload = k - PADDING_OVERHEAD
+    if payload < 1:
+        raise ValueError("Modulus is too small for block encryption")
+
+    blocks = []
+    for start in range(0, len(data), payload):
+        m = int.from_bytes(_pad_block(data[start:start + payload], k), 'big')
+        blocks.append(pow(m, e, n).to_bytes(k, 'big'))
+    return b''.join(blocks)
+
+def rsa_decrypt_bytes(cipher: bytes, private_key: tuple) -> bytes:
+    """RSA decryption of the output of rsa_encrypt_bytes"""
+    private_key = _as_private_key(private_key)
+    k = _modulus_bytes(private_key[1])
+    if len(cipher) % k != 0:
+        raise ValueError("Cipher text is not a whole number of blocks")
+
+    blocks = []
+    for start in range(0, len(cipher), k):
+        c = int.from_bytes(cipher[start:start + k], 'big')
+        blocks.append(_unpad_block(_rsa_decrypt_int(c, private_key).to_bytes(k, 'big')))
+    return b''.join(blocks)
+
+def _as_private_key(private_key: tuple) -> tuple:
+    """Normalise a (d, n) tuple or a full CRT private key"""
+    if len(private_key) == 2:
+        return tuple(private_key)
+    return RSAPrivateKey(*private_key)
+
+def _is_decimal_list(cipher: str) -> bool:
+    """True for the comma-separated per-character cipher text format"""
+    return ',' in cipher or cipher.strip().isdigit()
+
+def rsa_encrypt(text: str, public_key: tuple, packed: bool = False) -> str:
+    """RSA encryption
+
+    By default every character is encrypted on its own and the cipher
+    text is a comma-separated list of numbers. With packed=True the
+    UTF-8 bytes are packed into padded blocks and returned as base64.
+    """
+    if packed:
+        return base64.b64encode(rsa_encrypt_bytes(text.encode('utf-8'), public_key)).decode('ascii')
+
     e, n = public_key
     encrypted = []
-    
+
     for char in text:
         m = ord(char)
         c = pow(m, e, n)
         encrypted.append(str(c))
-    
+
     return ','.join(encrypted)
 
 def rsa_decrypt(cipher: str, private_key: tuple) -> str:
-    """RSA decryption"""
-    d, n = private_key
+    """RSA decryption of either cipher text format of rsa_encrypt"""
+    private_key = _as_private_key(private_key)
+
+    if not _is_decimal_list(cipher):
+        packed = base64.b64decode(''.join(cipher.split()), validate=True)
+        return rsa_decrypt_bytes(packed, private_key).decode('utf-8')
+
     encrypted_nums = [int(x) for x in cipher.split(',')]
-    
-    result = ""
-    for c in encrypted_nums:
-        m = pow(c, d, n)
-        result += chr(m)
-    
-    return result
\ No newline at end of file
+
+    return ''.join(chr(_rsa_decrypt_int(c, private_key)) for c in encrypted_nums)
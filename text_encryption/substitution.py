@@ -0,0 +1,107 @@
+"""
+Translation-Table Engine for Substitution Ciphers
+"""
+from functools import lru_cache
+
+UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+
+class LetterMap:
+    """Compiled letter substitution x -> (ax + b) mod 26
+
+    Uppercase and lowercase letters may use different offsets b, as the
+    Vigenere cipher does for non-letter key characters. Instances are
+    immutable and safe to share across threads.
+    """
+    __slots__ = ('a', 'upper_b', 'lower_b', 'table', 'byte_table')
+
+    def __init__(self, a: int, upper_b: int, lower_b: int):
+        self.a = a % 26
+        self.upper_b = upper_b % 26
+        self.lower_b = lower_b % 26
+        mapped = ''.join(self._map_char(c) for c in UPPERCASE + LOWERCASE)
+        self.table = str.maketrans(UPPERCASE + LOWERCASE, mapped)
+        self.byte_table = bytes.maketrans((UPPERCASE + LOWERCASE).encode(), mapped.encode())
+
+    def _map_char(self, char: str) -> str:
+        """Map a single cased character"""
+        if char.isupper():
+            return chr((self.a * (ord(char) - 65) + self.upper_b) % 26 + 65)
+        return chr((self.a * (ord(char) - 97) + self.lower_b) % 26 + 97)
+
+    def str_table(self, text: str) -> dict:
+        """Translation table covering every cased character of text"""
+        if text.isascii():
+            return self.table
+        # str.isupper()/islower() also accept non-ASCII letters
+        extra = {ord(c): self._map_char(c) for c in set(text)
+                 if not c.isascii() and (c.isupper() or c.islower())}
+        return {**self.table, **extra} if extra else self.table
+
+    def __call__(self, text):
+        """Apply the substitution to every letter of text (str or bytes)"""
+        if isinstance(text, (bytes, bytearray)):
+            return text.translate(self.byte_table)
+        return text.translate(self.str_table(text))
+
+@lru_cache(maxsize=128)
+def letter_map(a: int, upper_b: int, lower_b: int) -> LetterMap:
+    """Compiled LetterMap, kept in a bounded LRU"""
+    return LetterMap(a, upper_b, lower_b)
+
+def affine_map(a: int, b: int) -> LetterMap:
+    """Compiled map for E(x) = (ax + b) mod 26"""
+    return letter_map(a % 26, b % 26, b % 26)
+
+def affine_translate(text, a: int, b: int):
+    """Apply E(x) = (ax + b) mod 26 to every letter of text (str or bytes)"""
+    return affine_map(a, b)(text)
+
+def caesar_translate(text, shift: int):
+    """Shift every letter of text (str or bytes) by shift positions"""
+    return affine_map(1, shift)(text)
+
+class PeriodicShift:
+    """Shift letter i of a message by shifts[i % len(shifts)]
+
+    Holds one compiled LetterMap per key position. Each residue class
+    text[r::period] is translated at C speed and the classes are
+    interleaved back with extended-slice assignment.
+    """
+    __slots__ = ('upper_shifts', 'lower_shifts', '_encrypt_maps', '_decrypt_maps')
+
+    def __init__(self, upper_shifts: list, lower_shifts: list = None):
+        if len(upper_shifts) == 0:
+            raise ValueError("Key must not be empty")
+        if lower_shifts is None:
+            lower_shifts = upper_shifts
+        self.upper_shifts = tuple(upper_shifts)
+        self.lower_shifts = tuple(lower_shifts)
+        pairs = list(zip(upper_shifts, lower_shifts))
+        self._encrypt_maps = tuple(letter_map(1, u % 26, l % 26) for u, l in pairs)
+        self._decrypt_maps = tuple(letter_map(1, -u % 26, -l % 26) for u, l in pairs)
+
+    @staticmethod
+    def _apply(maps: tuple, text: str, offset: int) -> str:
+        """Translate text[r::period] with maps[(offset + r) % period]"""
+        period = len(maps)
+        if text.isascii():
+            data = text.encode('ascii')
+            out = bytearray(len(data))
+            for r in range(min(period, len(data))):
+                out[r::period] = data[r::period].translate(maps[(offset + r) % period].byte_table)
+            return out.decode('ascii')
+
+        chars = [''] * len(text)
+        for r in range(min(period, len(text))):
+            segment = text[r::period]
+            chars[r::period] = segment.translate(maps[(offset + r) % period].str_table(segment))
+        return ''.join(chars)
+
+    def encrypt(self, text: str, offset: int = 0) -> str:
+        """Encrypt text whose first character sits at key position offset"""
+        return self._apply(self._encrypt_maps, text, offset)
+
+    def decrypt(self, cipher: str, offset: int = 0) -> str:
+        """Decrypt cipher whose first character sits at key position offset"""
+        return self._apply(self._decrypt_maps, cipher, offset)
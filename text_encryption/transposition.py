@@ -1,64 +1,116 @@
 """
 Transposition Cipher Implementation
 """
-import math
+from functools import lru_cache
+from typing import Iterable, Iterator
 
-def transposition_encrypt(text: str, key: str) -> str:
-    """Transposition cipher encryption"""
-    # Remove spaces and convert to uppercase
-    text = text.replace(" ", "").upper()
+@lru_cache(maxsize=128)
+def column_layout(key: str, length: int) -> tuple:
+    """Return the (column, start, end) cipher text segment of each column"""
     key_len = len(key)
-    
-    # Create empty matrix
-    num_rows = math.ceil(len(text) / key_len)
-    matrix = [['' for _ in range(key_len)] for _ in range(num_rows)]
-    
-    # Fill matrix with text
-    idx = 0
-    for i in range(num_rows):
-        for j in range(key_len):
-            if idx < len(text):
-                matrix[i][j] = text[idx]
-                idx += 1
-    
+    if key_len == 0:
+        raise ValueError("Key must not be empty")
+
     # Get column order based on key
-    key_order = sorted(range(len(key)), key=lambda k: key[k])
-    
-    # Read columns in key order
-    cipher_text = ''
+    key_order = sorted(range(key_len), key=lambda k: key[k])
+
+    # Column `col` holds text[col::key_len] and is read out in key order
+    layout = []
+    start = 0
     for col in key_order:
-        for row in range(num_rows):
-            cipher_text += matrix[row][col]
-    
-    return cipher_text
+        end = start + len(range(col, length, key_len))
+        layout.append((col, start, end))
+        start = end
+
+    return tuple(layout)
+
+class Transposition:
+    """Columnar transposition cipher for a fixed key"""
+    __slots__ = ('key', 'key_len')
+
+    def __init__(self, key: str):
+        if len(key) == 0:
+            raise ValueError("Key must not be empty")
+        self.key = key
+        self.key_len = len(key)
+
+    def encrypt(self, text: str) -> str:
+        """Transposition cipher encryption"""
+        # Remove spaces and convert to uppercase
+        text = text.replace(" ", "").upper()
+        key_len = self.key_len
+
+        # Read columns in key order
+        return ''.join(text[col::key_len] for col, _, _ in column_layout(self.key, len(text)))
+
+    def decrypt(self, cipher: str) -> str:
+        """Transposition cipher decryption"""
+        key_len = self.key_len
+        layout = column_layout(self.key, len(cipher))
+
+        # Scatter each column segment back to every key_len-th position
+        if cipher.isascii():
+            data = cipher.encode('ascii')
+            plain = bytearray(len(data))
+            for col, start, end in layout:
+                plain[col::key_len] = data[start:end]
+            return plain.decode('ascii')
+
+        chars = [''] * len(cipher)
+        for col, start, end in layout:
+            chars[col::key_len] = cipher[start:end]
+        return ''.join(chars)
+
+def transposition_encrypt(text: str, key: str) -> str:
+    """Transposition cipher encryption"""
+    return Transposition(key).encrypt(text)
 
 def transposition_decrypt(cipher: str, key: str) -> str:
     """Transposition cipher decryption"""
+    return Transposition(key).decrypt(cipher)
+
+def _stream_block_size(key: str, block_size: int) -> int:
+    """Round block_size down to a whole number of rows"""
     key_len = len(key)
-    num_rows = math.ceil(len(cipher) / key_len)
-    
-    # Get column order
-    key_order = sorted(range(len(key)), key=lambda k: key[k])
-    inverse_order = [0] * len(key_order)
-    for i, pos in enumerate(key_order):
-        inverse_order[pos] = i
-    
-    # Create empty matrix
-    matrix = [['' for _ in range(key_len)] for _ in range(num_rows)]
-    
-    # Fill matrix column by column
-    idx = 0
-    for col in range(key_len):
-        actual_col = inverse_order[col]
-        for row in range(num_rows):
-            if idx < len(cipher):
-                matrix[row][actual_col] = cipher[idx]
-                idx += 1
-    
-    # Read row by row
-    plain_text = ''
-    for i in range(num_rows):
-        for j in range(key_len):
-            plain_text += matrix[i][j]
-    
-    return plain_text
\ No newline at end of file
+    if key_len == 0:
+        raise ValueError("Key must not be empty")
+    return max(key_len, block_size - block_size % key_len)
+
+def _blocks(chunks: Iterable[str], block_size: int, prepare=None) -> Iterator[str]:
+    """Regroup an iterable of text chunks into fixed-size blocks"""
+    buffer = ''
+    for chunk in chunks:
+        buffer += prepare(chunk) if prepare else chunk
+        pos = 0
+        while len(buffer) - pos >= block_size:
+            yield buffer[pos:pos + block_size]
+            pos += block_size
+        buffer = buffer[pos:]
+    if buffer:
+        yield buffer
+
+def transposition_encrypt_stream(chunks: Iterable[str], key: str,
+                                 block_size: int = 1 << 20) -> Iterator[str]:
+    """Encrypt a stream of text chunks, transposing each block on its own
+
+    Every block of block_size characters (after removing spaces) is
+    encrypted independently, so memory stays bounded by the block size.
+    A message no longer than one block encrypts exactly as with
+    transposition_encrypt.
+    """
+    cipher = Transposition(key)
+    block_size = _stream_block_size(key, block_size)
+
+    def clean(chunk: str) -> str:
+        return chunk.replace(" ", "").upper()
+
+    for block in _blocks(chunks, block_size, clean):
+        yield cipher.encrypt(block)
+
+def transposition_decrypt_stream(chunks: Iterable[str], key: str,
+                                 block_size: int = 1 << 20) -> Iterator[str]:
+    """Decrypt a stream produced by transposition_encrypt_stream"""
+    cipher = Transposition(key)
+    block_size = _stream_block_size(key, block_size)
+    for block in _blocks(chunks, block_size):
+        yield cipher.decrypt(block)
@@ -1,38 +1,27 @@
 """
 Vigenere Cipher Implementation
 """
+from .substitution import PeriodicShift
+
+def vigenere_shifts(key: str) -> tuple:
+    """Per-position shifts applied to (uppercase, lowercase) letters"""
+    key = key.upper()
+    upper = [ord(c) - 65 for c in key]
+    lower = [ord(c.lower()) - 97 for c in key]
+    return upper, lower
+
+class Vigenere(PeriodicShift):
+    """Vigenere cipher with one precompiled translation table per key letter"""
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        super().__init__(*vigenere_shifts(key))
+        self.key = key
+
 def vigenere_encrypt(text: str, key: str) -> str:
     """Vigenere cipher encryption"""
-    key = key.upper()
-    key_len = len(key)
-    result = ""
-    
-    for i, char in enumerate(text):
-        if char.isupper():
-            shift = ord(key[i % key_len]) - 65
-            result += chr((ord(char) + shift - 65) % 26 + 65)
-        elif char.islower():
-            shift = ord(key[i % key_len].lower()) - 97
-            result += chr((ord(char) + shift - 97) % 26 + 97)
-        else:
-            result += char
-    
-    return result
+    return Vigenere(key).encrypt(text)
 
 def vigenere_decrypt(cipher: str, key: str) -> str:
     """Vigenere cipher decryption"""
-    key = key.upper()
-    key_len = len(key)
-    result = ""
-    
-    for i, char in enumerate(cipher):
-        if char.isupper():
-            shift = ord(key[i % key_len]) - 65
-            result += chr((ord(char) - shift - 65) % 26 + 65)
-        elif char.islower():
-            shift = ord(key[i % key_len].lower()) - 97
-            result += chr((ord(char) - shift - 97) % 26 + 97)
-        else:
-            result += char
-    
-    return result
\ No newline at end of file
+    return Vigenere(key).decrypt(cipher)
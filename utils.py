@@ -1,9 +1,9 @@
 """
-Common utility functions
+Common utility functions and the number-theory core shared by the ciphers
 """
-import hashlib
 import math
-from typing import List
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
 def text_to_numbers(text: str) -> List[int]:
     """Convert text to numerical representation"""
@@ -13,9 +13,151 @@ def numbers_to_text(numbers: List[int]) -> str:
     """Convert numbers back to text"""
     return ''.join([chr(num) for num in numbers])
 
+# ============================================
+# GCD and modular inverses
+# ============================================
+
+gcd = math.gcd
+
+def lcm(a: int, b: int) -> int:
+    """Least common multiple"""
+    return abs(a * b) // gcd(a, b) if a and b else 0
+
+def egcd(a: int, b: int) -> Tuple[int, int, int]:
+    """Extended Euclid: return (g, x, y) with a*x + b*y = g = gcd(a, b)"""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+# Moduli up to this size get a precomputed table of all inverses
+SMALL_MODULUS_LIMIT = 1 << 16
+
+@lru_cache(maxsize=32)
+def inverse_table(m: int) -> Tuple[Optional[int], ...]:
+    """Table t with t[a] = a^-1 mod m, or None where a is not invertible"""
+    if not 1 < m <= SMALL_MODULUS_LIMIT:
+        raise ValueError(f"Inverse tables are limited to moduli 2..{SMALL_MODULUS_LIMIT}")
+    table = [None] * m
+    for a in range(1, m):
+        if table[a] is None and gcd(a, m) == 1:
+            inv = pow(a, -1, m)
+            table[a], table[inv] = inv, a
+    return tuple(table)
+
+INVERSES_MOD_26 = inverse_table(26)
+INVERSES_MOD_256 = inverse_table(256)
+
 def mod_inverse(a: int, m: int) -> int:
-    """Find modular inverse of a mod m"""
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
\ No newline at end of file
+    """Find modular inverse of a mod m, or None if gcd(a, m) != 1"""
+    if m == 26:
+        return INVERSES_MOD_26[a % 26]
+    if m == 256:
+        return INVERSES_MOD_256[a % 256]
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        return None
+
+def batch_mod_inverse(values: Iterable[int], m: int) -> List[int]:
+    """Invert many values mod m with a single modular inverse
+
+    Montgomery's trick: invert the product of all values once, then
+    peel the individual inverses off using the prefix products.
+    """
+    values = [v % m for v in values]
+    prefix = [1] * (len(values) + 1)
+    for i, v in enumerate(values):
+        prefix[i + 1] = prefix[i] * v % m
+
+    inv = mod_inverse(prefix[-1], m)
+    if inv is None:
+        raise ValueError("Not every value is invertible modulo m")
+
+    result = [0] * len(values)
+    for i in reversed(range(len(values))):
+        result[i] = inv * prefix[i] % m
+        inv = inv * values[i] % m
+    return result
+
+def crt(residues: Iterable[int], moduli: Iterable[int]) -> Tuple[int, int]:
+    """Chinese Remainder Theorem: return (x, M) with x = r_i mod m_i
+
+    Moduli need not be pairwise coprime; a ValueError is raised if the
+    congruences are inconsistent.
+    """
+    x, big_m = 0, 1
+    for r, m in zip(residues, moduli):
+        g, p, _ = egcd(big_m, m)
+        if (r - x) % g:
+            raise ValueError("Congruences have no common solution")
+        step = m // g
+        x += big_m * ((r - x) // g * p % step)
+        big_m *= step
+        x %= big_m
+    return x, big_m
+
+# ============================================
+# Primality
+# ============================================
+
+def _sieve(limit: int) -> List[int]:
+    """All primes below limit (sieve of Eratosthenes)"""
+    is_prime = bytearray([1]) * limit
+    is_prime[:2] = b'\x00\x00'
+    for p in range(2, math.isqrt(limit - 1) + 1):
+        if is_prime[p]:
+            is_prime[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return [p for p in range(limit) if is_prime[p]]
+
+SMALL_PRIMES = _sieve(2000)
+
+# Miller-Rabin with the first 13 primes as bases is exact below this bound
+_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+def is_probable_prime(n: int, rounds: int = 40) -> bool:
+    """Miller-Rabin primality test (exact for n < 3.3e24)"""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    # Write n - 1 = d * 2^s with d odd
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    if n < _DETERMINISTIC_LIMIT:
+        bases = SMALL_PRIMES[:13]
+    else:
+        # secrets (and the random module behind it) is only needed here
+        import secrets
+        bases = [secrets.randbelow(n - 3) + 2 for _ in range(rounds)]
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def random_prime(bits: int, coprime_to: int = 1) -> int:
+    """Random prime of exactly bits bits with gcd(coprime_to, p - 1) = 1"""
+    import secrets
+    if bits < 2:
+        raise ValueError("A prime needs at least 2 bits")
+    while True:
+        # Setting the two top bits makes the product of two such primes
+        # exactly 2 * bits long
+        candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        if gcd(coprime_to, candidate - 1) == 1 and is_probable_prime(candidate):
+            return candidate